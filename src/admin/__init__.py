@@ -7,5 +7,6 @@ from src.admin import (  # noqa: F401
     notifications,
     productivity,
     projects,
+    scheduler,
     services,
 )
@@ -91,6 +91,11 @@ class DevSuiteAdminSite(AdminSite):
                 "display_name": "Notifications",
                 "order": 3,
             },
+            "SchedulerJob": {
+                "group": "System & Users",
+                "display_name": "Scheduled Jobs",
+                "order": 4,
+            },
         }
 
         # Group models according to the model_map
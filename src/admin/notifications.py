@@ -1,13 +1,57 @@
 from django.contrib import admin
+from django.contrib.contenttypes.admin import GenericTabularInline
+from django.utils.html import format_html
 
 from src.admin.base import admin_site
+from src.admin.shared import format_placeholder
 from src.models.notifications import Notification
 
 
+class NotificationHistoryInline(GenericTabularInline):
+    """Read-only list of the notifications sent about an object."""
+
+    model = Notification
+    extra = 0
+    fields = ("recipient", "subject", "status", "sent_at")
+    readonly_fields = fields
+    can_delete = False
+    show_change_link = True
+    verbose_name_plural = "Notification History"
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Notification, site=admin_site)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ("recipient", "subject", "status", "sent_at", "created_at")
+    list_display = (
+        "recipient",
+        "subject",
+        "status",
+        "attempts",
+        "source_display",
+        "sent_at",
+        "created_at",
+    )
     list_filter = ("status", "created_at", "sent_at")
     search_fields = ("recipient", "subject", "message")
-    readonly_fields = ("created_at", "updated_at", "sent_at")
+    readonly_fields = (
+        "created_at",
+        "updated_at",
+        "sent_at",
+        "attempts",
+        "last_error",
+        "next_attempt_at",
+    )
     date_hierarchy = "created_at"
+
+    def get_queryset(self, request):
+        # Source objects of a page are fetched with one query per content type
+        return super().get_queryset(request).prefetch_related("content_object")
+
+    def source_display(self, obj):
+        if obj.content_object is None:
+            return format_placeholder()
+        return format_html("<a href='{}'>{}</a>", obj.source_url, obj.content_object)
+
+    source_display.short_description = "Related To"
@@ -0,0 +1,26 @@
+from django.contrib import admin
+
+from src.admin.base import admin_site
+from src.models.scheduler import SchedulerJob
+
+
+@admin.register(SchedulerJob, site=admin_site)
+class SchedulerJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "name",
+        "next_run_at",
+        "last_started_at",
+        "last_duration",
+        "locked_by",
+    )
+    search_fields = ("name",)
+    readonly_fields = (
+        "name",
+        "locked_until",
+        "locked_by",
+        "last_started_at",
+        "last_duration",
+        "last_error",
+        "created_at",
+        "updated_at",
+    )
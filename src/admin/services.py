@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from src.admin.notifications import NotificationHistoryInline
 from src.admin.shared import (
     admin_site,
     format_badge,
@@ -13,6 +14,7 @@ from src.admin.shared import (
     format_strong,
     format_strong_with_subtext,
 )
+from src.models.notifications import with_notification_history
 from src.models.services import Credential, Service
 
 
@@ -40,6 +42,7 @@ class ServiceAdmin(admin.ModelAdmin):
         "renewal_price_display",
         "expiry_display",
         "auto_renew_display",
+        "last_reminded_display",
     )
     list_filter = (
         "service_type",
@@ -51,7 +54,7 @@ class ServiceAdmin(admin.ModelAdmin):
     search_fields = ("name", "client__name", "provider")
     ordering = ("-created_at",)
     list_per_page = 25
-    inlines = [CredentialInline]
+    inlines = [CredentialInline, NotificationHistoryInline]
 
     fieldsets = (
         (
@@ -83,6 +86,10 @@ class ServiceAdmin(admin.ModelAdmin):
     )
     readonly_fields = ("created_at", "updated_at")
 
+    def get_queryset(self, request):
+        qs = super().get_queryset(request).select_related("client")
+        return with_notification_history(qs)
+
     def name_display(self, obj):
         return format_strong(obj.name)
 
@@ -142,6 +149,16 @@ class ServiceAdmin(admin.ModelAdmin):
 
     auto_renew_display.short_description = "Auto Renew"
 
+    def last_reminded_display(self, obj):
+        history = obj.notification_history
+        return (
+            timezone.localtime(history[0].sent_at).strftime("%b %d, %Y")
+            if history
+            else format_placeholder()
+        )
+
+    last_reminded_display.short_description = "Last Reminded"
+
     def save_model(self, request, obj, form, change):
         if obj.start_date and obj.expiry_date and obj.expiry_date < obj.start_date:
             self.message_user(
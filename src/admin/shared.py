@@ -34,7 +34,7 @@ def format_badge(label, background="#333", text_color="white"):
 
 
 def format_currency(amount):
-    return format_html("<b>${:,.2f}</b>", amount) if amount is not None else "—"
+    return format_html("<b>${}</b>", f"{amount:,.2f}") if amount is not None else "—"
 
 
 def format_boolean_icon(
@@ -4,6 +4,12 @@ from src.api.base import views
 
 urlpatterns = [
     path("", views.dashboard, name="dashboard"),
+    path("dashboard/<slug:panel>/", views.dashboard_panel, name="dashboard_panel"),
+    path(
+        "async/dashboard/<slug:panel>/",
+        views.adashboard_panel,
+        name="dashboard_panel_async",
+    ),
     path("login/", views.login_view, name="login"),
     path("logout/", views.logout_view, name="logout"),
 ]
@@ -1,18 +1,14 @@
-from datetime import timedelta
-
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate
 from django.contrib.auth import login as auth_login
 from django.contrib.auth import logout as auth_logout
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.db.models import Sum
+from django.http import Http404
 from django.shortcuts import redirect, render
-from django.utils import timezone
 
-from src.models.clients import Client
-from src.models.finance import Expense, Invoice
-from src.models.projects import Project, Task
-from src.models.services import Service
+from src.api.conditional import page_versions, versioned
+from src.models.dashboard import DASHBOARD_PANELS, apanel_context, panel_context
 
 
 def is_superuser(user):
@@ -48,57 +44,38 @@ def logout_view(request):
 @login_required(login_url="login")
 @user_passes_test(is_superuser, login_url="login")
 def dashboard(request):
-    # Date ranges
-    today = timezone.now().date()
-    month_ago = today - timedelta(days=30)
-
-    # Core metrics
-    total_clients = Client.objects.count()
-    active_projects = Project.objects.filter(status="In_PROGRESS").count()
-    pending_tasks = Task.objects.filter(status="TODO").count()
-
-    # Financial metrics
-    total_income = (
-        Invoice.objects.filter(status="PAID").aggregate(Sum("amount"))["amount__sum"]
-        or 0
-    )
-    pending_income = (
-        Invoice.objects.filter(status="SENT").aggregate(Sum("amount"))["amount__sum"]
-        or 0
+    # Only the page shell; every panel is fetched by HTMX once it loads
+    async_panels = getattr(settings, "DASHBOARD_ASYNC", False)
+    panel_url = "dashboard_panel_async" if async_panels else "dashboard_panel"
+    return render(request, "base/dashboard.html", {"panel_url": panel_url})
+
+
+def panel_models(request, panel):
+    return DASHBOARD_PANELS[panel][1] if panel in DASHBOARD_PANELS else ()
+
+
+@login_required(login_url="login")
+@user_passes_test(is_superuser, login_url="login")
+@versioned(daily=True, get_models=panel_models)
+def dashboard_panel(request, panel):
+    if panel not in DASHBOARD_PANELS:
+        raise Http404("Unknown dashboard panel")
+    return render(
+        request,
+        f"base/partials/dashboard_{panel}.html",
+        panel_context(panel, versions=page_versions(request)),
     )
-    monthly_expenses = (
-        Expense.objects.filter(date__gte=month_ago).aggregate(Sum("amount"))[
-            "amount__sum"
-        ]
-        or 0
+
+
+@login_required(login_url="login")
+@user_passes_test(is_superuser, login_url="login")
+@versioned(daily=True, get_models=panel_models)
+async def adashboard_panel(request, panel):
+    """Async version of dashboard_panel, for deployments under ASGI."""
+    if panel not in DASHBOARD_PANELS:
+        raise Http404("Unknown dashboard panel")
+    return render(
+        request,
+        f"base/partials/dashboard_{panel}.html",
+        await apanel_context(panel, versions=page_versions(request)),
     )
-    overdue_invoices = Invoice.objects.filter(status="OVERDUE").count()
-
-    # Recent Activity
-    recent_projects = Project.objects.select_related("client").order_by("-updated_at")[
-        :5
-    ]
-    recent_tasks = Task.objects.select_related("project").order_by("-updated_at")[:5]
-    upcoming_deadlines = Project.objects.filter(
-        deadline__gte=today, deadline__lte=today + timedelta(days=7)
-    ).order_by("deadline")[:5]
-
-    # Services expiring soon
-    expiring_services = Service.objects.filter(
-        expiry_date__gte=today, expiry_date__lte=today + timedelta(days=30)
-    ).order_by("expiry_date")[:5]
-
-    context = {
-        "total_clients": total_clients,
-        "active_projects": active_projects,
-        "pending_tasks": pending_tasks,
-        "total_income": total_income,
-        "pending_income": pending_income,
-        "monthly_expenses": monthly_expenses,
-        "overdue_invoices": overdue_invoices,
-        "recent_projects": recent_projects,
-        "recent_tasks": recent_tasks,
-        "upcoming_deadlines": upcoming_deadlines,
-        "expiring_services": expiring_services,
-    }
-    return render(request, "base/dashboard.html", context)
@@ -3,6 +3,7 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 from phonenumber_field.formfields import SplitPhoneNumberField
 
+from src.api.conditional import versioned
 from src.models.clients import Client
 
 
@@ -27,6 +28,7 @@ class ClientForm(forms.ModelForm):
         self.fields["short_code"].disabled = True
 
 
+@versioned(Client)
 def client_list(request):
     clients = Client.objects.all()
     return render(request, "clients/client_list.html", {"clients": clients})
@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime, time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from src.models.versions import model_state
+
+
+def page_versions(request):
+    """Model versions read by versioned() for this request, or None."""
+    state = getattr(request, "_model_state", None)
+    return state[0] if state else None
+
+
+def versioned(*models, daily=False, get_models=None):
+    """
+    Answers conditional GETs of a page built from `models` with 304 before
+    the view runs. The ETag holds the version of every model, so it changes
+    whenever one of their rows is saved or deleted, and Last-Modified is
+    the time of the latest such change. Pages that also depend on the
+    current day pass `daily=True`. `get_models(request, *args, **kwargs)`
+    picks the models from the view's arguments instead.
+    """
+
+    def load_state(request, *args, **kwargs):
+        # Versions and modification time are read once, in a single query
+        if not hasattr(request, "_model_state"):
+            page_models = get_models(request, *args, **kwargs) if get_models else models
+            request._model_state = model_state(*page_models)
+        return request._model_state
+
+    def etag(request, *args, **kwargs):
+        versions, _ = load_state(request, *args, **kwargs)
+        parts = [
+            *versions,
+            # The session key changes on login and, unlike request.user,
+            # can be read without a query, also in async views. Pages embed
+            # the CSRF token and HTMX requests get fragments.
+            request.session.session_key,
+            request.META.get("CSRF_COOKIE", ""),
+            bool(request.htmx),
+        ]
+        if daily:
+            parts.append(timezone.localdate())
+        return hashlib.md5(
+            "|".join(str(part) for part in parts).encode(), usedforsecurity=False
+        ).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        _, modified = load_state(request, *args, **kwargs)
+        if daily:
+            midnight = timezone.make_aware(
+                datetime.combine(timezone.localdate(), time.min)
+            )
+            modified = max(filter(None, [modified, midnight]))
+        return modified
+
+    def decorator(view):
+        conditional = condition(etag_func=etag, last_modified_func=last_modified)(view)
+        if iscoroutinefunction(view):
+            # condition() calls etag() and last_modified() synchronously, so
+            # async views read the versions before it runs
+            @wraps(view)
+            async def conditional_view(request, *args, **kwargs):
+                await sync_to_async(load_state)(request, *args, **kwargs)
+                return await conditional(request, *args, **kwargs)
+
+        else:
+            conditional_view = conditional
+
+        # no-cache makes browsers revalidate every time instead of guessing
+        # a freshness lifetime from Last-Modified
+        return cache_control(private=True, no_cache=True)(conditional_view)
+
+    return decorator
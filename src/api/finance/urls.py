@@ -4,6 +4,7 @@ from . import views
 
 urlpatterns = [
     path("", views.finance_dashboard, name="finance_dashboard"),
+    path("async/", views.afinance_dashboard, name="finance_dashboard_async"),
     # Invoices
     path("invoices/", views.invoice_list, name="invoice_list"),
     path("invoices/create/", views.invoice_create, name="invoice_create"),
@@ -1,44 +1,31 @@
-from django.db.models import Sum
 from django.shortcuts import HttpResponse, get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
+from src.api.conditional import versioned
 from src.models.clients import Client
+from src.models.dashboard import afinance_overview, finance_overview
 from src.models.finance import Expense, Invoice
+from src.models.notifications import Notification, with_notification_history
 from src.models.projects import Project
 from src.models.services import Service
 
 
+@versioned(Invoice, Expense, Client)
 def finance_dashboard(request):
-    invoices = Invoice.objects.all().order_by("-date_issued")
-    expenses = Expense.objects.all().order_by("-date")
+    return render(request, "finance/dashboard.html", finance_overview())
 
-    total_income = (
-        Invoice.objects.filter(status="PAID").aggregate(Sum("amount"))["amount__sum"]
-        or 0
-    )
-    total_expenses = Expense.objects.aggregate(Sum("amount"))["amount__sum"] or 0
-    net_profit = total_income - total_expenses
-
-    pending_income = (
-        Invoice.objects.exclude(status__in=["PAID", "CANCELLED", "DRAFT"]).aggregate(
-            Sum("amount")
-        )["amount__sum"]
-        or 0
-    )
 
-    context = {
-        "invoices": invoices[:5],
-        "expenses": expenses[:5],
-        "total_income": total_income,
-        "total_expenses": total_expenses,
-        "net_profit": net_profit,
-        "pending_income": pending_income,
-    }
-    return render(request, "finance/dashboard.html", context)
+@versioned(Invoice, Expense, Client)
+async def afinance_dashboard(request):
+    """Async version of finance_dashboard, for deployments under ASGI."""
+    return render(request, "finance/dashboard.html", await afinance_overview())
 
 
+@versioned(Invoice, Client, Project, Notification)
 def invoice_list(request):
-    invoices = Invoice.objects.all().order_by("-date_issued")
+    invoices = with_notification_history(
+        Invoice.objects.select_related("client", "project").order_by("-date_issued")
+    )
     return render(request, "finance/invoice_list.html", {"invoices": invoices})
 
 
@@ -71,7 +58,7 @@ def invoice_create(request):
 
 
 def invoice_edit(request, pk):
-    invoice = get_object_or_404(Invoice, pk=pk)
+    invoice = get_object_or_404(with_notification_history(Invoice.objects), pk=pk)
     if request.method == "POST":
         client_id = request.POST.get("client")
         project_id = request.POST.get("project")
@@ -109,6 +96,7 @@ def invoice_delete(request, pk):
     return redirect("finance_dashboard")
 
 
+@versioned(Expense)
 def expense_list(request):
     expenses = Expense.objects.all().order_by("-date")
     return render(request, "finance/expense_list.html", {"expenses": expenses})
@@ -1,37 +1,42 @@
+from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, render
 
-from src.models.notifications import Notification
+from src.models.notifications import Notification, status_counts
 
 
 def notifications_dashboard(request):
     recent_notifications = Notification.objects.all()[:10]
-    pending_count = Notification.objects.filter(status="PENDING").count()
-    failed_count = Notification.objects.filter(status="FAILED").count()
-    sent_count = Notification.objects.filter(status="SENT").count()
+    counts = status_counts()
 
     return render(
         request,
         "notifications/dashboard.html",
         {
             "recent_notifications": recent_notifications,
-            "pending_count": pending_count,
-            "failed_count": failed_count,
-            "sent_count": sent_count,
+            "pending_count": counts["PENDING"],
+            "failed_count": counts["FAILED"],
+            "sent_count": counts["SENT"],
         },
     )
 
 
 def notification_list(request):
-    notifications = Notification.objects.all()
+    # Source objects are fetched with one query per content type on the page
+    notifications = Notification.objects.defer(
+        "message", "last_error"
+    ).prefetch_related("content_object")
+    page = Paginator(notifications, 50).get_page(request.GET.get("page"))
     return render(
         request,
         "notifications/notification_list.html",
-        {"notifications": notifications},
+        {"notifications": page, "page_obj": page},
     )
 
 
 def notification_detail(request, pk):
-    notification = get_object_or_404(Notification, pk=pk)
+    notification = get_object_or_404(
+        Notification.objects.select_related("content_type"), pk=pk
+    )
     return render(
         request,
         "notifications/notification_detail.html",
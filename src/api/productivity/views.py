@@ -3,10 +3,12 @@ from datetime import datetime
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
+from src.api.conditional import versioned
 from src.models.productivity import Note, TimeEntry
 from src.models.projects import Project, Task
 
 
+@versioned(Note, TimeEntry, Project, Task)
 def productivity_dashboard(request):
     recent_notes = Note.objects.all()[:5]
     recent_time_entries = TimeEntry.objects.select_related("project", "task").all()[:5]
@@ -34,6 +36,7 @@ def productivity_dashboard(request):
     )
 
 
+@versioned(Note)
 def note_list(request):
     notes = Note.objects.all()
     return render(request, "productivity/note_list.html", {"notes": notes})
@@ -84,6 +87,7 @@ def _parse_datetime(value: str):
         return None
 
 
+@versioned(TimeEntry, Project, Task)
 def timeentry_list(request):
     time_entries = TimeEntry.objects.select_related("project", "task").all()
     return render(
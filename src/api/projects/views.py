@@ -1,10 +1,14 @@
 from django.shortcuts import HttpResponse, get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
+from src.api.conditional import versioned
 from src.api.projects.forms import ProjectForm, TaskForm
+from src.models.clients import Client
+from src.models.notifications import with_notification_history
 from src.models.projects import Project, Task
 
 
+@versioned(Project, Client)
 def project_list(request):
     projects = Project.objects.all().select_related("client")
     return render(request, "projects/project_list.html", {"projects": projects})
@@ -33,7 +37,9 @@ def get_kanban_context(project):
 
 
 def project_detail(request, pk):
-    project = get_object_or_404(Project, pk=pk)
+    project = get_object_or_404(
+        with_notification_history(Project.objects.select_related("client")), pk=pk
+    )
     context = get_kanban_context(project)
     # Add a blank task form for the "Add Task" modal/section
     context["task_form"] = TaskForm()
@@ -0,0 +1,128 @@
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from src.management.commands.benchmark_notifications import seed_benchmark_data
+from src.models.dashboard import (
+    ASYNC_DASHBOARD_PANELS,
+    DASHBOARD_PANELS,
+    afinance_overview,
+    finance_overview,
+)
+from src.models.finance import Expense, rebuild_finance_snapshots
+from src.models.projects import Project, Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares p50/p95 latency of the sync and async dashboards on seeded "
+        "data, bypassing the cache. Seeded data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=500,
+            help="Clients to seed, each with a project, task, invoice and service.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=50,
+            help="Times each dashboard is computed.",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        today = timezone.localdate()
+
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['clients']} clients...")
+            seed_dashboard_data(options["clients"])
+
+            def dashboard():
+                for compute, _ in DASHBOARD_PANELS.values():
+                    compute(today)
+
+            async def adashboard():
+                await asyncio.gather(
+                    *(compute(today) for compute in ASYNC_DASHBOARD_PANELS.values())
+                )
+
+            results = {
+                "dashboard": time_sync(dashboard, iterations),
+                "dashboard async": time_async(adashboard, iterations),
+                "finance": time_sync(finance_overview, iterations),
+                "finance async": time_async(afinance_overview, iterations),
+            }
+
+            # Leave the database as it was
+            transaction.set_rollback(True)
+
+        self.write_report(results)
+
+    def write_report(self, results):
+        self.stdout.write(f"{'View':<16} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, timings in results.items():
+            p50, p95 = percentiles(timings)
+            self.stdout.write(f"{name:<16} {p50:>8.2f} {p95:>8.2f}")
+
+
+def time_sync(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def time_async(func, iterations):
+    # One event loop for all iterations, as under an ASGI server, so only
+    # the view's own work is timed. async_to_sync runs the ORM calls on this
+    # thread, inside the seeding transaction.
+    async def run():
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await func()
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    return async_to_sync(run)()
+
+
+def percentiles(timings):
+    """Returns the p50 and p95 of `timings` in milliseconds."""
+    cuts = statistics.quantiles(timings, n=20, method="inclusive")
+    return statistics.median(timings) * 1000, cuts[18] * 1000
+
+
+def seed_dashboard_data(count):
+    """Seeds the notification benchmark data plus a task and expense per client."""
+    seed_benchmark_data(count)
+    today = timezone.localdate()
+    projects = Project.objects.filter(name__startswith="Benchmark Project")
+    Task.objects.bulk_create(
+        Task(project=project, title=f"Benchmark Task {project.pk}")
+        for project in projects
+    )
+    Expense.objects.bulk_create(
+        Expense(
+            description=f"Benchmark Expense {i}",
+            amount=Decimal("10.00"),
+            date=today - timedelta(days=i % 60),
+            category="Hosting",
+        )
+        for i in range(count)
+    )
+    # bulk_create skips the signals that maintain the snapshots
+    rebuild_finance_snapshots()
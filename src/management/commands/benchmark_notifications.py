@@ -0,0 +1,199 @@
+import socketserver
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from src.models.clients import Client
+from src.models.finance import Invoice
+from src.models.notifications import RunStats, check_and_send_notifications
+from src.models.projects import Project
+from src.models.reminders import rebuild_reminders
+from src.models.services import Service
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP to accept and count messages."""
+
+    # Replies are small writes; without this they wait for delayed ACKs
+    disable_nagle_algorithm = True
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 localhost SMTP sink")
+        while line := self.rfile.readline():
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith("EHLO"):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                self.server.count_message()
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                # HELO, MAIL, RCPT, RSET and NOOP are all accepted
+                self.reply("250 OK")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """
+    Local SMTP server that discards messages, run in a background thread,
+    so delivery can be measured without a mail provider.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), SMTPSinkHandler)
+        self.received = 0
+        self.lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def count_message(self):
+        with self.lock:
+            self.received += 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures notification throughput against a local SMTP sink. "
+        "Seeded data and sent notifications are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=500,
+            help="Clients to seed, each with a due project, invoice and service.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Emails sent per mail connection (defaults to NOTIFICATION_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--digest",
+            action="store_true",
+            default=None,
+            help="Send each recipient one combined email.",
+        )
+
+    def handle(self, *args, **options):
+        stats = RunStats()
+        with SMTPSink() as sink:
+            mail_settings = override_settings(
+                EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+                EMAIL_HOST="127.0.0.1",
+                EMAIL_PORT=sink.port,
+                EMAIL_HOST_USER="",
+                EMAIL_HOST_PASSWORD="",
+                EMAIL_USE_TLS=False,
+                EMAIL_USE_SSL=False,
+            )
+            with mail_settings, transaction.atomic():
+                self.stdout.write(f"Seeding {options['clients']} clients...")
+                seed_benchmark_data(options["clients"])
+
+                tracemalloc.start()
+                start = time.perf_counter()
+                check_and_send_notifications(
+                    batch_size=options["batch_size"],
+                    digest=options["digest"],
+                    stats=stats,
+                )
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                # Leave the database as it was
+                transaction.set_rollback(True)
+
+        self.write_report(stats, sink.received, elapsed, peak)
+
+    def write_report(self, stats, received, elapsed, peak):
+        deliver = stats.phases.get("deliver", {}).get("seconds") or elapsed
+        queries = sum(phase["queries"] for phase in stats.phases.values())
+
+        self.stdout.write(f"{'Phase':<12} {'Seconds':>8} {'Queries':>8}")
+        for name, phase in stats.phases.items():
+            self.stdout.write(
+                f"{name:<12} {phase['seconds']:>8.3f} {phase['queries']:>8}"
+            )
+        self.stdout.write(
+            f"Emails received: {received}  Failed: {stats.total('failed')}"
+        )
+        self.stdout.write(f"Total time: {elapsed:.3f}s  SQL queries: {queries}")
+        self.stdout.write(f"Peak memory: {peak / 1024 / 1024:.1f} MiB")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Throughput: {received / deliver:.1f} emails/s during delivery, "
+                f"{received / elapsed:.1f} emails/s overall"
+            )
+        )
+
+
+def seed_benchmark_data(count):
+    """Creates `count` clients with a project, invoice and service due tomorrow."""
+    tomorrow = timezone.localdate() + timedelta(days=1)
+    clients = Client.objects.bulk_create(
+        Client(
+            name=f"Benchmark Client {i}",
+            short_code=f"B{i:05d}",
+            email=f"client{i}@benchmark.invalid",
+            phone="",
+            address="",
+        )
+        for i in range(count)
+    )
+    projects = Project.objects.bulk_create(
+        Project(name=f"Benchmark Project {i}", client=client, deadline=tomorrow)
+        for i, client in enumerate(clients)
+    )
+    Invoice.objects.bulk_create(
+        Invoice(
+            client=client,
+            project=project,
+            invoice_number=f"{client.short_code}-0001",
+            amount=Decimal("100.00"),
+            due_date=tomorrow,
+            status="SENT",
+        )
+        for client, project in zip(clients, projects)
+    )
+    Service.objects.bulk_create(
+        Service(
+            client=client,
+            name=f"benchmark{i}.invalid",
+            service_type="DOMAIN",
+            expiry_date=tomorrow,
+        )
+        for i, client in enumerate(clients)
+    )
+    # bulk_create skips the signals that schedule reminders
+    rebuild_reminders()
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from src.models.notifications import (
+    drain_pending_notifications,
+    retry_failed_notifications,
+)
+
+
+class Command(BaseCommand):
+    help = "Delivers queued (PENDING) notifications or retries failed ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Notifications claimed per batch (defaults to NOTIFICATION_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Sender threads, each with its own mail connection (defaults to NOTIFICATION_WORKERS).",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=None,
+            help="Maximum emails per second, 0 for unlimited (defaults to NOTIFICATION_RATE_LIMIT).",
+        )
+        parser.add_argument(
+            "--digest",
+            action="store_true",
+            default=None,
+            help="Send each recipient one combined email per batch (defaults to NOTIFICATION_DIGEST).",
+        )
+        parser.add_argument(
+            "--retry",
+            action="store_true",
+            help="Retry FAILED notifications whose next attempt is due instead.",
+        )
+
+    def handle(self, *args, **options):
+        if options["retry"]:
+            self.stdout.write("Retrying failed notifications...")
+            drain, label = retry_failed_notifications, "failed"
+        else:
+            self.stdout.write("Delivering pending notifications...")
+            drain, label = drain_pending_notifications, "pending"
+
+        processed = drain(
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            rate=options["rate"],
+            digest=options["digest"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {processed} {label} notifications.")
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from src.models.notifications import prune_notifications
+
+
+class Command(BaseCommand):
+    help = "Archives or deletes old sent notifications in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Prune notifications older than this (defaults to NOTIFICATION_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Rows pruned per transaction (defaults to NOTIFICATION_PRUNE_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete the notifications instead of archiving them.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Pruning sent notifications...")
+        count = prune_notifications(
+            days=options["days"],
+            archive=not options["delete"],
+            batch_size=options["batch_size"],
+        )
+        action = "Deleted" if options["delete"] else "Archived"
+        self.stdout.write(self.style.SUCCESS(f"{action} {count} notifications."))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from src.models.finance import rebuild_finance_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily finance snapshots from invoices and expenses."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding daily finance snapshots...")
+        count = rebuild_finance_snapshots()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} snapshots."))
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from src.models.scheduler import (
+    SchedulerJob,
+    ensure_jobs,
+    run_due_jobs,
+    worker_name,
+)
+
+
+class Command(BaseCommand):
+    help = "Runs the periodic notification and invoice jobs until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tick",
+            type=float,
+            default=5,
+            help="Seconds to sleep between checks for due jobs.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the due jobs once and exit.",
+        )
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="Print the last run of each job and exit.",
+        )
+
+    def handle(self, *args, **options):
+        ensure_jobs()
+        if options["status"]:
+            self.write_status()
+            return
+
+        worker = worker_name()
+        self.stdout.write(f"Scheduler {worker} started.")
+        try:
+            while True:
+                # The process is long-lived, so drop connections the
+                # database may have closed since the last tick
+                close_old_connections()
+                for name in run_due_jobs(worker):
+                    job = SchedulerJob.objects.get(name=name)
+                    self.write_job(job)
+                if options["once"]:
+                    break
+                time.sleep(options["tick"])
+        except KeyboardInterrupt:
+            self.stdout.write("Scheduler stopped.")
+
+    def write_job(self, job):
+        duration = "-" if job.last_duration is None else f"{job.last_duration:.2f}s"
+        next_run = f"{job.next_run_at:%Y-%m-%d %H:%M:%S}"
+        line = f"{job.name:<20} {duration:>10}  next run {next_run}"
+        if job.last_error:
+            self.stdout.write(self.style.ERROR(f"{line}  error: {job.last_error}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(line))
+
+    def write_status(self):
+        for job in SchedulerJob.objects.all():
+            self.write_job(job)
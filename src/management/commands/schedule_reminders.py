@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from src.models.reminders import rebuild_reminders
+
+
+class Command(BaseCommand):
+    help = "Rebuilds scheduled reminders from project, service and invoice dates."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding scheduled reminders...")
+        count = rebuild_reminders()
+        self.stdout.write(self.style.SUCCESS(f"Scheduled {count} reminders."))
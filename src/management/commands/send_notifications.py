@@ -1,12 +1,101 @@
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 
-from src.models.notifications import check_and_send_notifications
+from src.models.notifications import (
+    RunStats,
+    check_and_send_notifications,
+    send_sharded_notifications,
+)
 
 
 class Command(BaseCommand):
     help = "Checks for upcoming deadlines and sends notifications."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Emails sent per mail connection (defaults to NOTIFICATION_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Only queue notifications as PENDING for deliver_notifications.",
+        )
+        parser.add_argument(
+            "--digest",
+            action="store_true",
+            default=None,
+            help="Send each recipient one combined email (defaults to NOTIFICATION_DIGEST).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run the full scan without sending emails or writing to the database.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Worker processes that split the scan by client (defaults to NOTIFICATION_PROCESSES).",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print per-category counts, SQL queries and timings per phase.",
+        )
+
     def handle(self, *args, **options):
+        if options["queue"] and options["digest"]:
+            raise CommandError(
+                "Queued notifications are combined when they are delivered; "
+                "use deliver_notifications --digest instead."
+            )
         self.stdout.write("Checking for notifications...")
-        check_and_send_notifications()
-        self.stdout.write(self.style.SUCCESS("Successfully sent notifications."))
+        stats = RunStats()
+        run_options = {
+            "batch_size": options["batch_size"],
+            "deliver": not options["queue"],
+            "digest": options["digest"],
+            "dry_run": options["dry_run"],
+            "stats": stats,
+        }
+        processes = options["processes"]
+        if processes is None:
+            processes = getattr(settings, "NOTIFICATION_PROCESSES", 1)
+
+        if processes > 1:
+            total = send_sharded_notifications(processes=processes, **run_options)
+        else:
+            total = len(check_and_send_notifications(**run_options))
+
+        if options["stats"]:
+            self.write_stats(stats)
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Dry run: {total} notifications would be sent.")
+            )
+        elif options["queue"]:
+            self.stdout.write(self.style.SUCCESS("Successfully queued notifications."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Successfully sent notifications."))
+
+    def write_stats(self, stats):
+        self.stdout.write(
+            f"{'Category':<12} {'Scanned':>8} {'Generated':>10} {'Deduplicated':>13} "
+            f"{'Sent':>6} {'Failed':>7}"
+        )
+        for category, counts in sorted(stats.categories.items()):
+            self.stdout.write(
+                f"{category:<12} {counts['scanned']:>8} {counts['generated']:>10} "
+                f"{counts['deduplicated']:>13} {counts['sent']:>6} "
+                f"{counts['failed']:>7}"
+            )
+
+        self.stdout.write(f"{'Phase':<12} {'Seconds':>8} {'Queries':>8}")
+        for name, phase in stats.phases.items():
+            self.stdout.write(
+                f"{name:<12} {phase['seconds']:>8.3f} {phase['queries']:>8}"
+            )
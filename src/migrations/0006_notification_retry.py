@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("src", "0005_alter_client_phone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="last_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["status", "next_attempt_at"],
+                name="src_notific_status_b3d174_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def schedule_existing_reminders(apps, schema_editor):
+    # Existing objects only get reminders once they have a row here
+    from src.models.reminders import build_reminders
+
+    ScheduledReminder = apps.get_model("src", "ScheduledReminder")
+    ScheduledReminder.objects.bulk_create(build_reminders(apps, horizons=False))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("src", "0006_notification_retry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduledReminder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("object_id", models.PositiveIntegerField()),
+                ("fire_at", models.DateTimeField()),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["fire_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["fire_at"], name="src_schedul_fire_at_77dcd4_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_type", "object_id"),
+                        name="unique_reminder_per_object",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(schedule_existing_reminders, migrations.RunPython.noop),
+    ]
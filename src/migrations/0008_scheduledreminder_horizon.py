@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:27
+
+from django.db import migrations, models
+
+
+def schedule_horizon_reminders(apps, schema_editor):
+    # Existing rows only cover the one-day horizon
+    from src.models.reminders import build_reminders
+
+    ScheduledReminder = apps.get_model("src", "ScheduledReminder")
+    ScheduledReminder.objects.all().delete()
+    ScheduledReminder.objects.bulk_create(build_reminders(apps))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("src", "0007_scheduledreminder"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="scheduledreminder",
+            name="unique_reminder_per_object",
+        ),
+        migrations.AddField(
+            model_name="scheduledreminder",
+            name="horizon",
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddConstraint(
+            model_name="scheduledreminder",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id", "horizon"),
+                name="unique_reminder_per_horizon",
+            ),
+        ),
+        migrations.RunPython(schedule_horizon_reminders, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("src", "0008_scheduledreminder_horizon"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SchedulerJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=100, unique=True)),
+                (
+                    "next_run_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("locked_until", models.DateTimeField(blank=True, null=True)),
+                ("locked_by", models.CharField(blank=True, max_length=255)),
+                ("last_started_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "last_duration",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Duration of the last run in seconds",
+                        null=True,
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+    ]
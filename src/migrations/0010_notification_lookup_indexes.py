@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("src", "0009_schedulerjob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["content_type", "object_id", "created_at"],
+                name="src_notific_content_c2a2bb_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["created_at"], name="src_notific_created_9daaaf_idx"
+            ),
+        ),
+    ]
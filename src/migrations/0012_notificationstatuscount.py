@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("src", "0011_notificationarchive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationStatusCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("status", models.CharField(max_length=20, unique=True)),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("src", "0012_notificationstatuscount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="params",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="template",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="message",
+            field=models.TextField(blank=True),
+        ),
+    ]
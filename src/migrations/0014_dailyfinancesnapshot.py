@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:50
+
+from django.db import migrations, models
+
+
+def build_snapshots(apps, schema_editor):
+    # The dashboards read only the snapshots, so fill them from existing rows
+    from src.models.finance import build_finance_snapshots
+
+    DailyFinanceSnapshot = apps.get_model("src", "DailyFinanceSnapshot")
+    DailyFinanceSnapshot.objects.bulk_create(build_finance_snapshots(apps))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("src", "0013_notification_template"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyFinanceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("category", models.CharField(blank=True, max_length=100)),
+                (
+                    "income",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "pending",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "overdue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("overdue_count", models.IntegerField(default=0)),
+                (
+                    "expenses",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+            ],
+            options={
+                "ordering": ["-date", "category"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "category"), name="unique_finance_snapshot"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_snapshots, migrations.RunPython.noop),
+    ]
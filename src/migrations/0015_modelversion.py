@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("src", "0014_dailyfinancesnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ModelVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("label", models.CharField(max_length=100, unique=True)),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                ("modified_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["label"],
+            },
+        ),
+    ]
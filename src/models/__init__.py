@@ -2,3 +2,8 @@
 
 # Create your models here.
 from .notifications import Notification as Notification
+from .notifications import NotificationArchive as NotificationArchive
+from .notifications import NotificationStatusCount as NotificationStatusCount
+from .reminders import ScheduledReminder as ScheduledReminder
+from .scheduler import SchedulerJob as SchedulerJob
+from .versions import ModelVersion as ModelVersion
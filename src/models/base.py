@@ -7,3 +7,16 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+def field_value(instance, field_name):
+    """
+    Value of a field converted to its Python type. Views may assign raw
+    form strings to fields before saving.
+    """
+    return instance._meta.get_field(field_name).to_python(getattr(instance, field_name))
+
+
+def migration_model(apps, model):
+    """`model` itself, or its historical version when a migration passes `apps`."""
+    return apps.get_model(model._meta.label) if apps else model
@@ -3,6 +3,7 @@ from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
 
 from src.models.base import TimeStampedModel
+from src.models.versions import track_versions
 
 
 class Client(TimeStampedModel):
@@ -59,3 +60,6 @@ class Client(TimeStampedModel):
 
     def __str__(self):
         return f"{self.name} ({self.short_code})"
+
+
+track_versions(Client)
@@ -0,0 +1,226 @@
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from src.models.clients import Client
+from src.models.finance import Expense, Invoice, afinance_totals, finance_totals
+from src.models.projects import Project, Task
+from src.models.services import Service
+from src.models.versions import model_versions, version_cache
+
+
+def _active_projects():
+    return Project.objects.filter(status="IN_PROGRESS")
+
+
+def _pending_tasks():
+    return Task.objects.filter(status="TODO")
+
+
+def _recent_projects():
+    return Project.objects.select_related("client").order_by("-updated_at")[:5]
+
+
+def _recent_tasks():
+    return Task.objects.select_related("project").order_by("-updated_at")[:5]
+
+
+def _upcoming_deadlines(today):
+    return Project.objects.filter(
+        deadline__gte=today, deadline__lte=today + timedelta(days=7)
+    ).order_by("deadline")[:5]
+
+
+def _expiring_services(today):
+    return Service.objects.filter(
+        expiry_date__gte=today, expiry_date__lte=today + timedelta(days=30)
+    ).order_by("expiry_date")[:5]
+
+
+def _finance_context(finance):
+    return {
+        "pending_income": finance["pending_income"],
+        "monthly_expenses": finance["period_expenses"],
+        "overdue_invoices": finance["overdue_invoices"],
+    }
+
+
+def stats_panel(today):
+    """Core metrics shown at the top of the dashboard."""
+    return {
+        "total_clients": Client.objects.count(),
+        "active_projects": _active_projects().count(),
+        "pending_tasks": _pending_tasks().count(),
+        "total_income": finance_totals()["total_income"],
+    }
+
+
+def finance_panel(today):
+    """Outstanding income, expenses of the last 30 days and overdue invoices."""
+    return _finance_context(finance_totals(expenses_since=today - timedelta(days=30)))
+
+
+# Lists are evaluated so the rows themselves are cached
+def recent_projects_panel(today):
+    return {"recent_projects": list(_recent_projects())}
+
+
+def recent_tasks_panel(today):
+    return {"recent_tasks": list(_recent_tasks())}
+
+
+def upcoming_deadlines_panel(today):
+    return {"upcoming_deadlines": list(_upcoming_deadlines(today))}
+
+
+def expiring_services_panel(today):
+    return {"expiring_services": list(_expiring_services(today))}
+
+
+async def alist(queryset):
+    return [obj async for obj in queryset]
+
+
+# Async versions of the panels, running their queries through the async ORM.
+# The independent queries of a panel are gathered concurrently.
+async def astats_panel(today):
+    clients, projects, tasks, finance = await asyncio.gather(
+        Client.objects.acount(),
+        _active_projects().acount(),
+        _pending_tasks().acount(),
+        afinance_totals(),
+    )
+    return {
+        "total_clients": clients,
+        "active_projects": projects,
+        "pending_tasks": tasks,
+        "total_income": finance["total_income"],
+    }
+
+
+async def afinance_panel(today):
+    finance = await afinance_totals(expenses_since=today - timedelta(days=30))
+    return _finance_context(finance)
+
+
+async def arecent_projects_panel(today):
+    return {"recent_projects": await alist(_recent_projects())}
+
+
+async def arecent_tasks_panel(today):
+    return {"recent_tasks": await alist(_recent_tasks())}
+
+
+async def aupcoming_deadlines_panel(today):
+    return {"upcoming_deadlines": await alist(_upcoming_deadlines(today))}
+
+
+async def aexpiring_services_panel(today):
+    return {"expiring_services": await alist(_expiring_services(today))}
+
+
+# Dashboard panels by name: the function computing each panel's context and
+# the models it reads. Every panel is loaded and cached on its own, so a
+# slow panel no longer holds up the rest of the page.
+DASHBOARD_PANELS = {
+    "stats": (stats_panel, (Client, Project, Task, Invoice)),
+    "finance": (finance_panel, (Invoice, Expense)),
+    "recent_projects": (recent_projects_panel, (Project, Client)),
+    "recent_tasks": (recent_tasks_panel, (Task, Project)),
+    "upcoming_deadlines": (upcoming_deadlines_panel, (Project,)),
+    "expiring_services": (expiring_services_panel, (Service,)),
+}
+
+ASYNC_DASHBOARD_PANELS = {
+    "stats": astats_panel,
+    "finance": afinance_panel,
+    "recent_projects": arecent_projects_panel,
+    "recent_tasks": arecent_tasks_panel,
+    "upcoming_deadlines": aupcoming_deadlines_panel,
+    "expiring_services": aexpiring_services_panel,
+}
+
+
+def panel_timeout(name):
+    """Cache timeout of a panel from DASHBOARD_PANEL_TIMEOUTS."""
+    default = getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 3600)
+    return getattr(settings, "DASHBOARD_PANEL_TIMEOUTS", {}).get(name, default)
+
+
+def _recent_invoices():
+    return Invoice.objects.select_related("client").order_by("-date_issued")[:5]
+
+
+def _recent_expenses():
+    return Expense.objects.order_by("-date")[:5]
+
+
+def _overview_context(invoices, expenses, totals):
+    total_income = totals["total_income"]
+    total_expenses = totals["total_expenses"]
+    return {
+        "invoices": invoices,
+        "expenses": expenses,
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_profit": total_income - total_expenses,
+        "pending_income": totals["pending_income"] + totals["overdue_income"],
+    }
+
+
+def finance_overview():
+    """Finance dashboard context: totals and the latest invoices and expenses."""
+    return _overview_context(
+        list(_recent_invoices()), list(_recent_expenses()), finance_totals()
+    )
+
+
+async def afinance_overview():
+    """Async version of finance_overview(), gathering its queries concurrently."""
+    invoices, expenses, totals = await asyncio.gather(
+        alist(_recent_invoices()), alist(_recent_expenses()), afinance_totals()
+    )
+    return _overview_context(invoices, expenses, totals)
+
+
+def _panel_key(name, today, versions=None):
+    if versions is None:
+        _, models = DASHBOARD_PANELS[name]
+        versions = model_versions(*models)
+    versions = "-".join(str(version) for version in versions)
+    return f"dashboard:{name}:{today}:{versions}"
+
+
+def panel_context(name, today=None, versions=None):
+    """
+    Returns the context of a dashboard panel from the cache, computing it on
+    a miss. The key holds the day and the version of every model the panel
+    reads, so an edit is visible on the next load of the panels it affects.
+    Callers that already read those `versions` pass them to save a query.
+    """
+    compute, _ = DASHBOARD_PANELS[name]
+    today = today or timezone.localdate()
+    key = _panel_key(name, today, versions)
+
+    cache = version_cache()
+    context = cache.get(key)
+    if context is None:
+        context = compute(today)
+        cache.set(key, context, panel_timeout(name))
+    return context
+
+
+async def apanel_context(name, today=None, versions=None):
+    """Async version of panel_context(), sharing its cache entries."""
+    today = today or timezone.localdate()
+    key = await sync_to_async(_panel_key)(name, today, versions)
+
+    cache = version_cache()
+    context = await cache.aget(key)
+    if context is None:
+        context = await ASYNC_DASHBOARD_PANELS[name](today)
+        await cache.aset(key, context, panel_timeout(name))
+    return context
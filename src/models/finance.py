@@ -1,9 +1,18 @@
-from django.db import models
+from collections import defaultdict
+from decimal import Decimal
 
-from src.models.base import TimeStampedModel
+from django.contrib.contenttypes.fields import GenericRelation
+from django.db import models, transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+
+from src.models.base import TimeStampedModel, field_value, migration_model
 from src.models.clients import Client
 from src.models.projects import Project
 from src.models.services import Service
+from src.models.versions import bump_version, track_versions
 
 
 class Invoice(TimeStampedModel):
@@ -25,6 +34,15 @@ class Invoice(TimeStampedModel):
     date_issued = models.DateField(auto_now_add=True)
     due_date = models.DateField()
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="DRAFT")
+    # Notifications sent about this object, newest first
+    notifications = GenericRelation("src.Notification")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored amount so a save can move it in the snapshots
+        remember_contribution(instance, field_names)
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.id:
@@ -66,6 +84,13 @@ class Expense(models.Model):
     category = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored amount so a save can move it in the snapshots
+        remember_contribution(instance, field_names)
+        return instance
+
     def __str__(self):
         return f"{self.description} - {self.amount}"
 
@@ -81,3 +106,220 @@ class Payment(models.Model):
 
     def __str__(self):
         return f"Payment of {self.amount} for {self.invoice}"
+
+
+class DailyFinanceSnapshot(models.Model):
+    """
+    Finance totals per day, and per category for expenses, kept up to date
+    as invoices and expenses change. Invoices count on the day they were
+    issued, under an empty category. Range metrics sum these rows instead
+    of scanning the invoice and expense tables.
+    """
+
+    date = models.DateField()
+    category = models.CharField(max_length=100, blank=True)
+    income = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    pending = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    overdue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    overdue_count = models.IntegerField(default=0)
+    expenses = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["-date", "category"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "category"], name="unique_finance_snapshot"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Finance snapshot {self.date} {self.category}".strip()
+
+
+# Snapshot column holding the amount of invoices in each status
+INVOICE_SNAPSHOT_FIELDS = {"PAID": "income", "SENT": "pending", "OVERDUE": "overdue"}
+
+
+def _invoice_contribution(invoice):
+    """(date, category, {column: delta}) an invoice adds to the snapshots."""
+    field = INVOICE_SNAPSHOT_FIELDS.get(invoice.status)
+    if field is None or invoice.date_issued is None:
+        return None
+    deltas = {field: field_value(invoice, "amount")}
+    if invoice.status == "OVERDUE":
+        deltas["overdue_count"] = 1
+    return (field_value(invoice, "date_issued"), "", deltas)
+
+
+def _expense_contribution(expense):
+    deltas = {"expenses": field_value(expense, "amount")}
+    return (field_value(expense, "date"), expense.category, deltas)
+
+
+def change_snapshot(day, category, **deltas):
+    """Adds `deltas` to the snapshot columns of `day` and `category`."""
+    DailyFinanceSnapshot.objects.get_or_create(date=day, category=category)
+    DailyFinanceSnapshot.objects.filter(date=day, category=category).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def _apply(contribution, sign):
+    if contribution is not None:
+        day, category, deltas = contribution
+        change_snapshot(
+            day, category, **{field: sign * delta for field, delta in deltas.items()}
+        )
+
+
+# Functions returning what a row adds to the snapshots, and the fields they
+# read, per model
+SNAPSHOT_SOURCES = {
+    Invoice: (_invoice_contribution, {"date_issued", "status", "amount"}),
+    Expense: (_expense_contribution, {"date", "category", "amount"}),
+}
+
+
+def remember_contribution(instance, field_names):
+    """Remembers what a row loaded with `field_names` contributes."""
+    contribution_for, fields = SNAPSHOT_SOURCES[type(instance)]
+    # Rows loaded without some of the fields are read again before a save
+    if fields.issubset(field_names):
+        instance._snapshot_contribution = contribution_for(instance)
+
+
+def load_contribution(sender, instance, raw=False, **kwargs):
+    """Makes sure the row's stored contribution is known before it changes."""
+    if raw or hasattr(instance, "_snapshot_contribution"):
+        return
+    stored = None
+    if not instance._state.adding:
+        stored = sender._base_manager.filter(pk=instance.pk).first()
+    instance._snapshot_contribution = getattr(stored, "_snapshot_contribution", None)
+
+
+def update_snapshot(sender, instance, raw=False, **kwargs):
+    """Moves the saved row's contribution from its stored state to its new one."""
+    if raw:
+        return
+    previous = instance._snapshot_contribution
+    current = SNAPSHOT_SOURCES[sender][0](instance)
+    if previous != current:
+        _apply(previous, -1)
+        _apply(current, 1)
+    instance._snapshot_contribution = current
+
+
+def remove_from_snapshot(sender, instance, **kwargs):
+    _apply(instance._snapshot_contribution, -1)
+
+
+for model in SNAPSHOT_SOURCES:
+    pre_save.connect(load_contribution, sender=model)
+    post_save.connect(update_snapshot, sender=model)
+    pre_delete.connect(load_contribution, sender=model)
+    post_delete.connect(remove_from_snapshot, sender=model)
+
+track_versions(Invoice, Expense)
+
+
+def build_finance_snapshots(apps=None):
+    """
+    Returns unsaved snapshots computed from the invoice and expense tables.
+    Migrations pass their `apps` to build them from historical models.
+    """
+    invoice_model = migration_model(apps, Invoice)
+    expense_model = migration_model(apps, Expense)
+    snapshot_model = migration_model(apps, DailyFinanceSnapshot)
+
+    totals = defaultdict(lambda: defaultdict(Decimal))
+    invoice_rows = invoice_model.objects.values("date_issued").annotate(
+        **{
+            field: Sum("amount", filter=Q(status=status))
+            for status, field in INVOICE_SNAPSHOT_FIELDS.items()
+        },
+        overdue_count=Count("pk", filter=Q(status="OVERDUE")),
+    )
+    for row in invoice_rows:
+        day = row.pop("date_issued")
+        for field, value in row.items():
+            totals[(day, "")][field] += value or 0
+    expense_rows = expense_model.objects.values("date", "category").annotate(
+        total=Sum("amount")
+    )
+    for row in expense_rows:
+        totals[(row["date"], row["category"])]["expenses"] += row["total"]
+
+    return [
+        snapshot_model(date=day, category=category, **values)
+        for (day, category), values in totals.items()
+    ]
+
+
+def rebuild_finance_snapshots():
+    """Recreates every snapshot from the invoice and expense tables."""
+    snapshots = build_finance_snapshots()
+    with transaction.atomic():
+        DailyFinanceSnapshot.objects.all().delete()
+        DailyFinanceSnapshot.objects.bulk_create(snapshots)
+    # Cached totals were read from the old rows
+    bump_version(Invoice)
+    bump_version(Expense)
+    return len(snapshots)
+
+
+def _finance_aggregates(expenses_since):
+    zero = Value(Decimal("0.00"), output_field=models.DecimalField())
+    totals = {
+        "total_income": Coalesce(Sum("income"), zero),
+        "pending_income": Coalesce(Sum("pending"), zero),
+        "overdue_income": Coalesce(Sum("overdue"), zero),
+        "overdue_invoices": Coalesce(Sum("overdue_count"), 0),
+        "total_expenses": Coalesce(Sum("expenses"), zero),
+    }
+    if expenses_since:
+        totals["period_expenses"] = Coalesce(
+            Sum("expenses", filter=Q(date__gte=expenses_since)), zero
+        )
+    return totals
+
+
+def finance_totals(expenses_since=None):
+    """
+    Returns the paid, outstanding (SENT) and overdue invoice totals, the
+    overdue invoice count and the expense total from the daily snapshots in
+    one query. With `expenses_since`, `period_expenses` sums the expenses
+    from that day on.
+    """
+    return DailyFinanceSnapshot.objects.aggregate(**_finance_aggregates(expenses_since))
+
+
+async def afinance_totals(expenses_since=None):
+    """Async version of finance_totals()."""
+    return await DailyFinanceSnapshot.objects.aaggregate(
+        **_finance_aggregates(expenses_since)
+    )
+
+
+def mark_overdue_invoices(today=None):
+    """Marks sent invoices past their due date as OVERDUE and returns the count."""
+    today = today or timezone.localdate()
+    due = Invoice.objects.filter(status="SENT", due_date__lt=today)
+    with transaction.atomic():
+        moved = list(
+            due.values("date_issued").annotate(total=Sum("amount"), count=Count("pk"))
+        )
+        updated = due.update(status="OVERDUE")
+        # update() sends no signals, so move the amounts in the snapshots
+        # and invalidate cached invoice data here
+        for row in moved:
+            change_snapshot(
+                row["date_issued"],
+                "",
+                pending=-row["total"],
+                overdue=row["total"],
+                overdue_count=row["count"],
+            )
+    if updated:
+        bump_version(Invoice)
+    return updated
@@ -0,0 +1,36 @@
+from django.template import Context, Engine
+
+
+class MessageTemplates:
+    """
+    Subject and body templates of notification emails, one pair per message
+    key in `templates/notifications/email/` (`<key>_subject.txt` and
+    `<key>.txt`). Each template is compiled the first time an instance
+    renders it, so a run or delivery batch compiles every key only once.
+    """
+
+    def __init__(self):
+        self.engine = Engine.get_default()
+        self.compiled = {}
+
+    def _template(self, name):
+        if name not in self.compiled:
+            self.compiled[name] = self.engine.get_template(
+                f"notifications/email/{name}.txt"
+            )
+        return self.compiled[name]
+
+    def _render(self, name, params):
+        # Emails are plain text, so values must not be HTML-escaped
+        return self._template(name).render(Context(params, autoescape=False))
+
+    def subject(self, key, params):
+        return self._render(f"{key}_subject", params).strip()
+
+    def body(self, key, params):
+        return self._render(key, params).rstrip("\n")
+
+
+def message_params(**values):
+    """Template parameters as strings, so they can be stored as JSON."""
+    return {name: str(value) for name, value in values.items()}
@@ -1,33 +1,65 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import chain
+
+import django
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.core.mail import send_mail
-from django.db import models
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection
+from django.db import connections, models, transaction
+from django.db.models.functions import Mod
+from django.urls import reverse
 from django.utils import timezone
 
 from src.models.base import TimeStampedModel
 from src.models.finance import Invoice
+from src.models.messages import MessageTemplates, message_params
 from src.models.productivity import TimeEntry
 from src.models.projects import Milestone, Project, Task
+from src.models.reminders import (
+    clear_past_reminders,
+    due_reminder_ids,
+    horizon_dates,
+    start_of_day,
+)
 from src.models.services import Service
+from src.models.versions import bump_version, track_versions
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class Notification(TimeStampedModel):
     STATUS_CHOICES = [
         ("PENDING", "Pending"),
+        # Being sent by the process that created it; never claimed by workers
+        ("SENDING", "Sending"),
         ("SENT", "Sent"),
         ("FAILED", "Failed"),
     ]
 
     recipient = models.EmailField()
     subject = models.CharField(max_length=255)
-    message = models.TextField()
+    message = models.TextField(blank=True)
+    # Message template key and parameters; the body is rendered from them
+    # at send time when the message itself is not stored
+    template = models.CharField(max_length=100, blank=True)
+    params = models.JSONField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
     sent_at = models.DateTimeField(null=True, blank=True)
 
+    # Delivery attempts; failed rows are retried at next_attempt_at
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
     # Generic relation to link to the source object (Project, Invoice, etc.)
     content_type = models.ForeignKey(
         ContentType, on_delete=models.CASCADE, null=True, blank=True
@@ -37,26 +69,234 @@ class Notification(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+            # Deduplication and history lookups by source object; filter the
+            # day as a created_at range so the index covers it too
+            models.Index(fields=["content_type", "object_id", "created_at"]),
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"Notification to {self.recipient}: {self.subject}"
 
-    def send(self):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status to track changes for the status counters
+        if "status" in field_names:
+            instance._db_status = instance.status
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        adjust_status_counts([self])
+
+    @property
+    def source_url(self):
+        """
+        Link to the page of the source object, or its admin page for models
+        without one. Prefetch `content_object` when listing notifications.
+        """
+        obj = self.content_object
+        if obj is None:
+            return None
+        model = type(obj)
+        if model in SOURCE_URLS:
+            return SOURCE_URLS[model](obj)
+        from src.admin.base import admin_site
+
+        opts = obj._meta
+        return reverse(
+            f"{admin_site.name}:{opts.app_label}_{opts.model_name}_change",
+            args=[obj.pk],
+        )
+
+    def mark_sent(self):
+        self.status = "SENT"
+        self.sent_at = timezone.now()
+        self.attempts += 1
+        self.next_attempt_at = None
+
+    def mark_failed(self, error):
+        """
+        Records a failed attempt and schedules the next one with exponential
+        backoff, or gives up once NOTIFICATION_MAX_ATTEMPTS is reached.
+        """
+        max_attempts = getattr(settings, "NOTIFICATION_MAX_ATTEMPTS", 5)
+        backoff = getattr(settings, "NOTIFICATION_RETRY_BACKOFF", 60)
+
+        self.status = "FAILED"
+        self.attempts += 1
+        self.last_error = str(error)
+        if self.attempts < max_attempts:
+            delay = backoff * 2 ** (self.attempts - 1)
+            self.next_attempt_at = timezone.now() + timezone.timedelta(seconds=delay)
+        else:
+            self.next_attempt_at = None
+
+    def render_body(self, templates=None):
+        """The stored message, or the body rendered from the template."""
+        if self.message or not self.template:
+            return self.message
+        return (templates or MessageTemplates()).body(self.template, self.params)
+
+    @property
+    def body(self):
+        return self.render_body()
+
+    def send(self, connection=None, commit=True, templates=None):
+        # Rendering errors, such as a stored template key that no longer
+        # exists, fail this notification rather than the whole batch
         try:
-            send_mail(
+            email = EmailMessage(
                 self.subject,
-                self.message,
+                self.render_body(templates),
                 settings.DEFAULT_FROM_EMAIL,
                 [self.recipient],
-                fail_silently=False,
+                connection=connection,
             )
-            self.status = "SENT"
-            self.sent_at = timezone.now()
+            email.send(fail_silently=False)
+            self.mark_sent()
         except Exception as e:
-            self.status = "FAILED"
-            # In a real app, we might want to log the error 'e'
-            print(f"Failed to send email: {e}")
-        self.save()
+            logger.warning(f"Failed to send email to {self.recipient}: {e}")
+            self.mark_failed(e)
+        if commit:
+            self.save()
+
+
+# Pages showing each kind of source object
+SOURCE_URLS = {
+    Project: lambda project: reverse("project_detail", args=[project.pk]),
+    Milestone: lambda milestone: reverse("project_detail", args=[milestone.project_id]),
+    Task: lambda task: reverse("task_detail", args=[task.pk]),
+    Invoice: lambda invoice: reverse("invoice_edit", args=[invoice.pk]),
+    TimeEntry: lambda entry: reverse("timeentry_edit", args=[entry.pk]),
+}
+
+
+# Deletes are left out so pruning can delete rows without loading them;
+# prune_notifications() bumps the version itself
+track_versions(Notification, deletes=False)
+
+
+class NotificationArchive(models.Model):
+    """
+    Compact copy of a pruned SENT notification, kept for the delivery
+    history without the message body. See `prune_notifications()`.
+    """
+
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    created_at = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, null=True, blank=True
+    )
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["content_type", "object_id"]),
+        ]
+
+    def __str__(self):
+        return f"Archived notification to {self.recipient}: {self.subject}"
+
+
+class NotificationStatusCount(models.Model):
+    """
+    Maintained number of notifications per status, read by the dashboard
+    instead of counting the table when NOTIFICATION_STATUS_COUNTER is set.
+    """
+
+    status = models.CharField(max_length=20, unique=True)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.status}: {self.count}"
+
+
+def count_statuses():
+    """Counts the notifications per status with a single aggregate query."""
+    return Notification.objects.aggregate(
+        **{
+            status: models.Count("pk", filter=models.Q(status=status))
+            for status, _ in Notification.STATUS_CHOICES
+        }
+    )
+
+
+def refresh_status_counts():
+    """Recomputes the maintained status counters from the table."""
+    counts = count_statuses()
+    for status, count in counts.items():
+        NotificationStatusCount.objects.update_or_create(
+            status=status, defaults={"count": count}
+        )
+    return counts
+
+
+def status_counts():
+    """
+    Returns {status: count}, read from the maintained counters when
+    NOTIFICATION_STATUS_COUNTER is enabled and counted otherwise.
+    """
+    if not getattr(settings, "NOTIFICATION_STATUS_COUNTER", False):
+        return count_statuses()
+    counts = dict(NotificationStatusCount.objects.values_list("status", "count"))
+    if len(counts) < len(Notification.STATUS_CHOICES):
+        return refresh_status_counts()
+    return counts
+
+
+def adjust_status_counts(notifications=(), removed=None):
+    """
+    Applies the status changes of saved `notifications` since they were
+    loaded or last counted, and `removed` ({status: rows deleted}), to the
+    maintained counters. Does nothing unless NOTIFICATION_STATUS_COUNTER is
+    set. Writes that bypass these helpers, such as admin deletions, are
+    corrected by `refresh_status_counts()`, which the scheduler runs.
+    """
+    if not getattr(settings, "NOTIFICATION_STATUS_COUNTER", False):
+        return
+    changes = defaultdict(int)
+    for status, count in (removed or {}).items():
+        changes[status] -= count
+    for notification in notifications:
+        previous = getattr(notification, "_db_status", None)
+        if previous != notification.status:
+            if previous:
+                changes[previous] -= 1
+            changes[notification.status] += 1
+            notification._db_status = notification.status
+
+    for status, delta in changes.items():
+        if delta:
+            updated = NotificationStatusCount.objects.filter(status=status).update(
+                count=models.F("count") + delta
+            )
+            if not updated:
+                refresh_status_counts()
+                return
+
+
+def with_notification_history(queryset):
+    """
+    Prefetches the sent notifications of every object in `queryset` (a
+    model with a `notifications` GenericRelation) into
+    `notification_history`, newest first, with one extra query in total.
+    """
+    history = Notification.objects.filter(status="SENT").only(
+        "recipient", "subject", "sent_at", "created_at", "content_type", "object_id"
+    )
+    return queryset.prefetch_related(
+        models.Prefetch(
+            "notifications", queryset=history, to_attr="notification_history"
+        )
+    )
 
 
 def get_admin_emails():
@@ -70,8 +310,268 @@ def get_admin_emails():
     return list(User.objects.filter(is_superuser=True).values_list("email", flat=True))
 
 
+class RateLimiter:
+    """Spaces calls to `wait()` so no more than `rate` happen per second."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(self.next_slot, now) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def send_digest(notifications, connection=None, templates=None):
+    """
+    Sends one email combining several notifications for the same recipient.
+    Every notification keeps its own row and records the shared outcome.
+    """
+    try:
+        body = "\n\n".join(
+            f"{notification.subject}\n{notification.render_body(templates)}"
+            for notification in notifications
+        )
+        email = EmailMessage(
+            f"DevSuite Digest: {len(notifications)} notifications",
+            body,
+            settings.DEFAULT_FROM_EMAIL,
+            [notifications[0].recipient],
+            connection=connection,
+        )
+        email.send(fail_silently=False)
+    except Exception as e:
+        logger.warning(f"Failed to send digest to {notifications[0].recipient}: {e}")
+        for notification in notifications:
+            notification.mark_failed(e)
+        return
+
+    for notification in notifications:
+        notification.mark_sent()
+
+
+def _group_by_recipient(notifications):
+    groups = {}
+    for notification in notifications:
+        groups.setdefault(notification.recipient, []).append(notification)
+    return list(groups.values())
+
+
+def _send_batch(notifications, connection=None, throttle=None, digest=False):
+    """
+    Sends notifications over a single mail connection without touching the
+    database, so it is safe to call from worker threads. In digest mode each
+    recipient gets one combined email.
+    """
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning(f"Failed to open mail connection: {e}")
+        for notification in notifications:
+            notification.mark_failed(e)
+        return
+
+    if digest:
+        groups = _group_by_recipient(notifications)
+    else:
+        groups = [[notification] for notification in notifications]
+
+    # Bodies stored as template keys are rendered with templates compiled
+    # once for the batch
+    templates = MessageTemplates()
+    try:
+        for group in groups:
+            if throttle:
+                throttle.wait()
+            if len(group) > 1:
+                send_digest(group, connection=connection, templates=templates)
+            else:
+                group[0].send(connection=connection, commit=False, templates=templates)
+    finally:
+        connection.close()
+
+
+def _save_outcomes(notifications):
+    """Writes delivery results back with one bulk update per status."""
+    now = timezone.now()
+    for status in ("SENT", "FAILED"):
+        delivered = [n for n in notifications if n.status == status]
+        for notification in delivered:
+            notification.updated_at = now
+        Notification.objects.bulk_update(
+            delivered,
+            [
+                "status",
+                "sent_at",
+                "attempts",
+                "last_error",
+                "next_attempt_at",
+                "updated_at",
+            ],
+        )
+    adjust_status_counts(notifications)
+    # bulk_update() sends no signals; sent rows show in reminder history
+    bump_version(Notification)
+
+
+def deliver_notifications(notifications, batch_size=None, digest=False):
+    """
+    Sends saved notifications over a shared mail connection.
+    The connection is reopened every `batch_size` emails, so a dropped
+    session only fails the rest of its own batch. With `digest=True` all
+    notifications for a recipient are combined into one email.
+    """
+    batch_size = batch_size or getattr(settings, "NOTIFICATION_BATCH_SIZE", 50)
+    connection = get_connection()
+
+    if digest:
+        # Keep each recipient's notifications together in one batch
+        groups = _group_by_recipient(notifications)
+        batches = [
+            list(chain.from_iterable(groups[start : start + batch_size]))
+            for start in range(0, len(groups), batch_size)
+        ]
+    else:
+        batches = [
+            notifications[start : start + batch_size]
+            for start in range(0, len(notifications), batch_size)
+        ]
+
+    for batch in batches:
+        _send_batch(batch, connection, digest=digest)
+
+    _save_outcomes(notifications)
+
+
+def _drain(filters, batch_size=None, workers=None, rate=None, digest=None):
+    """
+    Delivers notifications matching `filters` and returns how many were
+    processed. Rows are claimed a batch at a time with
+    SELECT ... FOR UPDATE SKIP LOCKED, so several worker processes can drain
+    the queue without double-sending. Each batch is split across a thread pool
+    where every thread holds its own mail connection, and sending is capped at
+    `rate` messages per second. In digest mode (`NOTIFICATION_DIGEST`) the
+    rows of a batch are combined into one email per recipient.
+    """
+    batch_size = batch_size or getattr(settings, "NOTIFICATION_BATCH_SIZE", 50)
+    workers = workers or getattr(settings, "NOTIFICATION_WORKERS", 4)
+    rate = rate if rate is not None else getattr(settings, "NOTIFICATION_RATE_LIMIT", 0)
+    throttle = RateLimiter(rate) if rate else None
+    if digest is None:
+        digest = getattr(settings, "NOTIFICATION_DIGEST", False)
+
+    processed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # Claimed rows stay locked until their outcomes are committed
+            with transaction.atomic():
+                batch = list(
+                    Notification.objects.select_for_update(skip_locked=True)
+                    .filter(**filters)
+                    .order_by("created_at")[:batch_size]
+                )
+                if not batch:
+                    break
+
+                # A recipient's rows stay in one chunk so they share a digest
+                groups = _group_by_recipient(batch)
+                chunks = [
+                    list(chain.from_iterable(groups[i::workers]))
+                    for i in range(workers)
+                ]
+                list(
+                    pool.map(
+                        lambda chunk: _send_batch(
+                            chunk, throttle=throttle, digest=digest
+                        ),
+                        [chunk for chunk in chunks if chunk],
+                    )
+                )
+                _save_outcomes(batch)
+            processed += len(batch)
+
+    return processed
+
+
+def drain_pending_notifications(batch_size=None, workers=None, rate=None, digest=None):
+    """Delivers queued PENDING notifications, see `_drain()`."""
+    return _drain({"status": "PENDING"}, batch_size, workers, rate, digest)
+
+
+def retry_failed_notifications(batch_size=None, workers=None, rate=None, digest=None):
+    """
+    Retries FAILED notifications whose next attempt is due.
+    Rows that exhausted their attempts have no next_attempt_at and are skipped.
+    """
+    filters = {"status": "FAILED", "next_attempt_at__lte": timezone.now()}
+    return _drain(filters, batch_size, workers, rate, digest)
+
+
+def prune_notifications(days=None, archive=True, batch_size=None):
+    """
+    Moves SENT notifications created more than `days` ago
+    (NOTIFICATION_RETENTION_DAYS) to NotificationArchive, or only deletes
+    them with `archive=False`. Rows are handled `batch_size` at a time
+    (NOTIFICATION_PRUNE_BATCH_SIZE), each batch in its own short
+    transaction, so locks stay brief on a busy table. Returns the count.
+    """
+    if days is None:
+        days = getattr(settings, "NOTIFICATION_RETENTION_DAYS", 90)
+    if batch_size is None:
+        batch_size = getattr(settings, "NOTIFICATION_PRUNE_BATCH_SIZE", 1000)
+    cutoff = timezone.now() - timezone.timedelta(days=days)
+    fields = [
+        "id",
+        "recipient",
+        "subject",
+        "created_at",
+        "sent_at",
+        "content_type_id",
+        "object_id",
+    ]
+
+    pruned = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Notification.objects.filter(status="SENT", created_at__lt=cutoff)
+                .order_by("created_at")
+                .values(*fields)[:batch_size]
+            )
+            if not rows:
+                break
+            ids = [row.pop("id") for row in rows]
+            if archive:
+                NotificationArchive.objects.bulk_create(
+                    NotificationArchive(**row) for row in rows
+                )
+            Notification.objects.filter(id__in=ids).delete()
+            adjust_status_counts(removed={"SENT": len(ids)})
+        pruned += len(ids)
+    if pruned:
+        bump_version(Notification)
+    return pruned
+
+
+def created_on(day):
+    """
+    Lookups for notifications created on `day`. A created_at range, unlike
+    `created_at__date`, can be answered from the created_at indexes.
+    """
+    return {
+        "created_at__gte": start_of_day(day),
+        "created_at__lt": start_of_day(day + timezone.timedelta(days=1)),
+    }
+
+
 def create_and_send(recipient, subject, message, obj=None):
-    """Helper to create and send a notification."""
+    """Helper to create and send a single notification outside of a scan."""
     # Avoid duplicate notifications for the same event on the same day
     if obj:
         ct = ContentType.objects.get_for_model(obj)
@@ -80,7 +580,7 @@ def create_and_send(recipient, subject, message, obj=None):
             subject=subject,
             content_type=ct,
             object_id=obj.id,
-            created_at__date=timezone.localdate(),
+            **created_on(timezone.localdate()),
         ).exists()
         if already_sent:
             return
@@ -89,6 +589,7 @@ def create_and_send(recipient, subject, message, obj=None):
         recipient=recipient,
         subject=subject,
         message=message,
+        status="SENDING",
         content_type=ContentType.objects.get_for_model(obj) if obj else None,
         object_id=obj.id if obj else None,
     )
@@ -96,119 +597,432 @@ def create_and_send(recipient, subject, message, obj=None):
     notification.send()
 
 
-def check_and_send_notifications():
+class RunStats:
+    """Row counters and per-phase timings of one notification run."""
+
+    def __init__(self):
+        self.categories = defaultdict(
+            lambda: {
+                "scanned": 0,
+                "generated": 0,
+                "deduplicated": 0,
+                "sent": 0,
+                "failed": 0,
+            }
+        )
+        self.phases = {}
+
+    def count(self, category, counter, amount=1):
+        self.categories[category][counter] += amount
+
+    def total(self, counter):
+        """Sum of `counter` over all categories."""
+        return sum(counts[counter] for counts in self.categories.values())
+
+    @contextmanager
+    def phase(self, name):
+        """Records wall time and SQL query count of the enclosed block."""
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with db_connection.execute_wrapper(count_query):
+            yield
+        self.phases[name] = {
+            "seconds": time.perf_counter() - start,
+            "queries": queries,
+        }
+
+    def as_dict(self):
+        """Plain data of the counters, so they can be sent between processes."""
+        return {
+            "categories": {name: dict(c) for name, c in self.categories.items()},
+            "phases": self.phases,
+        }
+
+    def merge(self, data):
+        """
+        Adds the counters of another run from `as_dict()`. Phases of parallel
+        runs overlap, so the slowest time is kept and queries are summed.
+        """
+        for category, counts in data["categories"].items():
+            for counter, amount in counts.items():
+                self.count(category, counter, amount)
+        for name, phase in data["phases"].items():
+            merged = self.phases.setdefault(name, {"seconds": 0, "queries": 0})
+            merged["seconds"] = max(merged["seconds"], phase["seconds"])
+            merged["queries"] += phase["queries"]
+
+
+class NotificationRun:
     """
-    Checks for upcoming deadlines/due dates and sends notifications.
-    Should be called periodically (e.g., via a cron job or Celery beat).
+    Collects the notifications of one scan so they can be delivered together.
+    Keys of notifications already sent today are loaded once up front, so
+    deduplication is a set lookup instead of a query per email, and the
+    collected rows are inserted with a single bulk_create.
     """
-    today = timezone.localdate()
-    tomorrow = today + timezone.timedelta(days=1)
 
-    admin_emails = get_admin_emails()
-    if not admin_emails:
-        print("Warning: No admin emails found.")
+    def __init__(self, today=None, stats=None, shard=None):
+        self.today = today or timezone.localdate()
+        self.stats = stats if stats is not None else RunStats()
+        self.shard = shard
+        self.templates = MessageTemplates()
+        self.store_templates = getattr(settings, "NOTIFICATION_STORE_TEMPLATES", False)
+        self.outbox = []
+        self.sent_keys = set(
+            Notification.objects.filter(
+                content_type__isnull=False, **created_on(self.today)
+            ).values_list("recipient", "subject", "content_type_id", "object_id")
+        )
+        # Warm the content type cache for every notified model in one query
+        ContentType.objects.get_for_models(
+            Project, Milestone, Task, Service, Invoice, TimeEntry
+        )
+
+    def for_shard(self, queryset, client_field):
+        """
+        Limits `queryset` to the clients of this run's shard, given as
+        (index, count), by taking the client id modulo the shard count.
+        """
+        if self.shard is None:
+            return queryset
+        index, count = self.shard
+        return queryset.alias(shard=Mod(client_field, count)).filter(shard=index)
+
+    @property
+    def is_first_shard(self):
+        return self.shard is None or self.shard[0] == 0
+
+    def scan(self, category, queryset):
+        """Evaluates a category query, recording how many rows it returned."""
+        rows = list(queryset)
+        self.stats.count(category, "scanned", len(rows))
+        return rows
+
+    def add(self, recipient, template, params, obj=None):
+        """
+        Adds a notification rendered from the `template` message key, unless
+        one with the same subject was already sent today for `obj`. With
+        NOTIFICATION_STORE_TEMPLATES only the key and parameters are stored
+        and the body is rendered when the notification is sent.
+        """
+        subject = self.templates.subject(template, params)
+        content_type = ContentType.objects.get_for_model(obj) if obj else None
+        category = obj._meta.model_name if obj else "other"
+        if obj:
+            key = (recipient, subject, content_type.id, obj.id)
+            if key in self.sent_keys:
+                self.stats.count(category, "deduplicated")
+                return None
+            self.sent_keys.add(key)
+        self.stats.count(category, "generated")
+
+        if self.store_templates:
+            message = ""
+        else:
+            message, params = self.templates.body(template, params), None
+        notification = Notification(
+            recipient=recipient,
+            subject=subject,
+            message=message,
+            template=template,
+            params=params,
+            content_type=content_type,
+            object_id=obj.id if obj else None,
+        )
+        self.outbox.append(notification)
+        return notification
+
+    def save(self, sending=False):
+        """
+        Inserts the collected notifications as PENDING for the queue workers,
+        or as SENDING when this run delivers them itself, so no worker
+        draining the queue can send them a second time.
+        """
+        if sending:
+            for notification in self.outbox:
+                notification.status = "SENDING"
+        Notification.objects.bulk_create(self.outbox)
+        adjust_status_counts(self.outbox)
+
+    def deliver(self, batch_size=None, digest=False):
+        deliver_notifications(self.outbox, batch_size=batch_size, digest=digest)
+        for notification in self.outbox:
+            category = (
+                notification.content_type.model
+                if notification.content_type_id
+                else "other"
+            )
+            if notification.status == "SENT":
+                self.stats.count(category, "sent")
+            elif notification.status == "FAILED":
+                self.stats.count(category, "failed")
+
+
+def _due_in(due_date, today):
+    """Subject suffix naming the reminder horizon, empty for next-day reminders."""
+    days = (due_date - today).days
+    return "" if days == 1 else f" (in {days} days)"
+
+
+def _collect_notifications(run, admin_emails):
+    """Scans every category for due objects and adds their notifications to `run`."""
+    today = run.today
+    due_ids = due_reminder_ids(today)
 
     # --- Projects (Deadline) ---
-    # Notify Client & Admin if deadline is tomorrow
-    projects_due = Project.objects.filter(deadline=tomorrow)
-    for project in projects_due:
+    # Notify Client & Admin when the deadline is one of the configured horizons
+    projects_due = (
+        Project.objects.filter(
+            id__in=due_ids[Project], deadline__in=horizon_dates(Project, today)
+        )
+        .select_related("client")
+        .only("name", "deadline", "client__name", "client__email")
+    )
+    projects_due = run.for_shard(projects_due, "client_id")
+    for project in run.scan("project", projects_due):
+        params = message_params(
+            project=project.name,
+            client=project.client.name,
+            deadline=project.deadline,
+            due_in=_due_in(project.deadline, today),
+        )
         # Notify Client
         if project.client.email:
-            create_and_send(
-                recipient=project.client.email,
-                subject=f"Project Deadline Reminder: {project.name}",
-                message=f"Dear {project.client.name},\n\nThe project '{project.name}' is due on {project.deadline}.\n\nRegards,\nDevSuite",
-                obj=project,
-            )
+            run.add(project.client.email, "project_client", params, obj=project)
 
         # Notify Admin
         for email in admin_emails:
-            create_and_send(
-                recipient=email,
-                subject=f"Admin Alert: Project Deadline - {project.name}",
-                message=f"Project '{project.name}' for client {project.client.name} is due on {project.deadline}.",
-                obj=project,
-            )
+            run.add(email, "project_admin", params, obj=project)
 
     # --- Milestones (Due Date) ---
-    # Notify Client & Admin if due_date is tomorrow
-    milestones_due = Milestone.objects.filter(due_date=tomorrow, is_completed=False)
-    for milestone in milestones_due:
+    # Notify Client & Admin when the due date is one of the configured horizons
+    milestones_due = (
+        Milestone.objects.filter(
+            id__in=due_ids[Milestone],
+            due_date__in=horizon_dates(Milestone, today),
+            is_completed=False,
+        )
+        .select_related("project__client")
+        .only(
+            "title",
+            "due_date",
+            "project__name",
+            "project__client__name",
+            "project__client__email",
+        )
+    )
+    milestones_due = run.for_shard(milestones_due, "project__client_id")
+    for milestone in run.scan("milestone", milestones_due):
         project = milestone.project
+        params = message_params(
+            milestone=milestone.title,
+            project=project.name,
+            client=project.client.name,
+            due_date=milestone.due_date,
+            due_in=_due_in(milestone.due_date, today),
+        )
         # Notify Client
         if project.client.email:
-            create_and_send(
-                recipient=project.client.email,
-                subject=f"Milestone Due: {milestone.title}",
-                message=f"Dear {project.client.name},\n\nThe milestone '{milestone.title}' for project '{project.name}' is due on {milestone.due_date}.\n\nRegards,\nDevSuite",
-                obj=milestone,
-            )
+            run.add(project.client.email, "milestone_client", params, obj=milestone)
 
         # Notify Admin
         for email in admin_emails:
-            create_and_send(
-                recipient=email,
-                subject=f"Admin Alert: Milestone Due - {milestone.title}",
-                message=f"Milestone '{milestone.title}' (Project: {project.name}) is due on {milestone.due_date}.",
-                obj=milestone,
-            )
+            run.add(email, "milestone_admin", params, obj=milestone)
 
     # --- Tasks (Due Date) ---
     # Notify Admin only
-    tasks_due = Task.objects.filter(due_date=tomorrow).exclude(status="DONE")
-    for task in tasks_due:
+    tasks_due = (
+        Task.objects.filter(
+            id__in=due_ids[Task], due_date__in=horizon_dates(Task, today)
+        )
+        .exclude(status="DONE")
+        .select_related("project")
+        .only("title", "due_date", "project__name")
+    )
+    tasks_due = run.for_shard(tasks_due, "project__client_id")
+    for task in run.scan("task", tasks_due):
+        params = message_params(
+            task=task.title,
+            project=task.project.name,
+            due_date=task.due_date,
+            due_in=_due_in(task.due_date, today),
+        )
         for email in admin_emails:
-            create_and_send(
-                recipient=email,
-                subject=f"Task Due: {task.title}",
-                message=f"Task '{task.title}' (Project: {task.project.name}) is due on {task.due_date}.",
-                obj=task,
-            )
+            run.add(email, "task_admin", params, obj=task)
 
     # --- Services (Expiry Date) ---
     # Notify Client
-    services_expiring = Service.objects.filter(expiry_date=tomorrow)
-    for service in services_expiring:
+    services_expiring = (
+        Service.objects.filter(
+            id__in=due_ids[Service], expiry_date__in=horizon_dates(Service, today)
+        )
+        .select_related("client")
+        .only("name", "service_type", "expiry_date", "client__name", "client__email")
+    )
+    services_expiring = run.for_shard(services_expiring, "client_id")
+    for service in run.scan("service", services_expiring):
         if service.client.email:
-            create_and_send(
-                recipient=service.client.email,
-                subject=f"Service Expiry Warning: {service.name}",
-                message=f"Dear {service.client.name},\n\nYour service '{service.name}' ({service.get_service_type_display()}) expires on {service.expiry_date}.\nPlease renew it soon.\n\nRegards,\nDevSuite",
-                obj=service,
+            params = message_params(
+                service=service.name,
+                service_type=service.get_service_type_display(),
+                client=service.client.name,
+                expiry_date=service.expiry_date,
+                due_in=_due_in(service.expiry_date, today),
             )
+            run.add(service.client.email, "service_client", params, obj=service)
 
     # --- Invoices (Due Date) ---
     # Notify Client
-    invoices_due = Invoice.objects.filter(
-        due_date=tomorrow, status__in=["SENT", "OVERDUE"]
+    invoices_due = (
+        Invoice.objects.filter(
+            id__in=due_ids[Invoice],
+            due_date__in=horizon_dates(Invoice, today),
+            status__in=["SENT", "OVERDUE"],
+        )
+        .select_related("client")
+        .only("invoice_number", "amount", "due_date", "client__name", "client__email")
     )
-    for invoice in invoices_due:
+    invoices_due = run.for_shard(invoices_due, "client_id")
+    for invoice in run.scan("invoice", invoices_due):
         if invoice.client.email:
-            create_and_send(
-                recipient=invoice.client.email,
-                subject=f"Invoice Due: {invoice.invoice_number}",
-                message=f"Dear {invoice.client.name},\n\nInvoice {invoice.invoice_number} for {invoice.amount} is due on {invoice.due_date}.\nPlease make payment.\n\nRegards,\nDevSuite",
-                obj=invoice,
+            params = message_params(
+                invoice=invoice.invoice_number,
+                amount=invoice.amount,
+                client=invoice.client.name,
+                due_date=invoice.due_date,
+                due_in=_due_in(invoice.due_date, today),
             )
+            run.add(invoice.client.email, "invoice_client", params, obj=invoice)
 
     # --- Productivity / TimeEntries ---
     # Notify Admin for recently completed time entries (last 24h)
-    recent_entries = TimeEntry.objects.filter(
-        end_time__gte=timezone.now() - timezone.timedelta(hours=24),
-        end_time__lte=timezone.now(),
+    # Entries need not belong to a client, so the first shard handles them all
+    if not run.is_first_shard:
+        return
+
+    recent_entries = run.scan(
+        "timeentry",
+        TimeEntry.objects.filter(
+            end_time__gte=timezone.now() - timezone.timedelta(hours=24),
+            end_time__lte=timezone.now(),
+        ).only("description", "duration", "end_time"),
+    )
+
+    # Entries that were already notified about on any day, fetched in one query
+    notified_entry_ids = set(
+        Notification.objects.filter(
+            content_type=ContentType.objects.get_for_model(TimeEntry),
+            object_id__in=[entry.id for entry in recent_entries],
+        ).values_list("object_id", flat=True)
     )
 
     for entry in recent_entries:
-        # Check if we already sent a notification for this entry
-        if Notification.objects.filter(
-            content_type=ContentType.objects.get_for_model(entry), object_id=entry.id
-        ).exists():
+        if entry.id in notified_entry_ids:
+            run.stats.count("timeentry", "deduplicated", len(admin_emails))
             continue
 
+        params = message_params(
+            description=entry.description,
+            duration=entry.duration,
+            end_time=entry.end_time,
+        )
         for email in admin_emails:
-            create_and_send(
-                recipient=email,
-                subject=f"Time Entry Logged: {entry.description}",
-                message=f"User logged time for '{entry.description}'.\nDuration: {entry.duration}\nEnd Time: {entry.end_time}",
-                obj=entry,
-            )
+            run.add(email, "timeentry_admin", params, obj=entry)
+
+
+def check_and_send_notifications(
+    batch_size=None, deliver=True, digest=None, dry_run=False, stats=None, shard=None
+):
+    """
+    Checks for upcoming deadlines/due dates and sends notifications.
+    Should be called periodically (e.g., via a cron job or Celery beat).
+    Only objects with a ScheduledReminder firing today are loaded, so the
+    cost of a run follows the number of reminders due, not the table sizes.
+    All emails of a run are delivered together over one mail connection
+    per `batch_size` messages. With `deliver=False` the notifications are
+    only queued as PENDING for `drain_pending_notifications()`.
+    In digest mode (`NOTIFICATION_DIGEST`) each recipient gets a single email.
+    A `dry_run` performs the full scan without sending or writing anything.
+    Counters and per-phase timings are collected into `stats` if given.
+    A `shard` of (index, count) limits the run to the clients whose id
+    modulo `count` equals `index`; see `send_sharded_notifications()`.
+    """
+    if digest is None:
+        digest = getattr(settings, "NOTIFICATION_DIGEST", False)
+    if stats is None:
+        stats = RunStats()
+
+    with stats.phase("setup"):
+        admin_emails = get_admin_emails()
+        if not admin_emails:
+            print("Warning: No admin emails found.")
+        run = NotificationRun(stats=stats, shard=shard)
+
+    with stats.phase("scan"):
+        _collect_notifications(run, admin_emails)
+
+    if dry_run:
+        return run.outbox
+
+    with stats.phase("save"):
+        run.save(sending=deliver)
+        # Reminders that fired on earlier days are no longer needed
+        if run.is_first_shard:
+            clear_past_reminders(run.today)
+
+    if deliver:
+        with stats.phase("deliver"):
+            run.deliver(batch_size=batch_size, digest=digest)
+    return run.outbox
+
+
+def _run_shard(index, count, **options):
+    stats = RunStats()
+    check_and_send_notifications(shard=(index, count), stats=stats, **options)
+    return stats.as_dict()
+
+
+def send_sharded_notifications(
+    processes=None,
+    batch_size=None,
+    deliver=True,
+    digest=None,
+    dry_run=False,
+    stats=None,
+):
+    """
+    Runs `check_and_send_notifications()` split by client across a pool of
+    `processes` (NOTIFICATION_PROCESSES) worker processes. Each process
+    scans and delivers the notifications of its own clients over its own
+    database and mail connections; their counters are merged into `stats`.
+    Returns the number of notifications generated.
+    """
+    if processes is None:
+        processes = getattr(settings, "NOTIFICATION_PROCESSES", 1)
+    if stats is None:
+        stats = RunStats()
+    options = {
+        "batch_size": batch_size,
+        "deliver": deliver,
+        "digest": digest,
+        "dry_run": dry_run,
+    }
+
+    # Forked workers must open their own database connections
+    connections.close_all()
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=django.setup
+    ) as executor:
+        futures = [
+            executor.submit(_run_shard, index, processes, **options)
+            for index in range(processes)
+        ]
+        for future in futures:
+            stats.merge(future.result())
+
+    return stats.total("generated")
@@ -2,6 +2,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 
 from src.models.projects import Project, Task
+from src.models.versions import track_versions
 
 
 class Note(models.Model):
@@ -63,3 +64,6 @@ class TimeEntry(models.Model):
             str(self.duration).split(".")[0] if self.duration else "In Progress"
         )
         return f"{self.description} — {duration_str}"
+
+
+track_versions(Note, TimeEntry)
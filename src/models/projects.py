@@ -1,9 +1,11 @@
+from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
 from src.models.base import TimeStampedModel
 from src.models.clients import Client
+from src.models.versions import track_versions
 
 
 class Project(TimeStampedModel):
@@ -24,6 +26,8 @@ class Project(TimeStampedModel):
     deadline = models.DateField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PLANNING")
     budget = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    # Notifications sent about this object, newest first
+    notifications = GenericRelation("src.Notification")
 
     class Meta:
         ordering = ["-created_at"]
@@ -91,3 +95,6 @@ class Task(TimeStampedModel):
 
     def __str__(self):
         return f"{self.title} — {self.get_status_display()}"
+
+
+track_versions(Project, Task)
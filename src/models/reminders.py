@@ -0,0 +1,201 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from src.models.base import TimeStampedModel, field_value, migration_model
+from src.models.finance import Invoice
+from src.models.projects import Milestone, Project, Task
+from src.models.services import Service
+
+
+class ScheduledReminder(TimeStampedModel):
+    """
+    A reminder that fires `horizon` days before its source object is due.
+    Rows are kept in sync when the source object is saved or deleted, so the
+    notification scan only reads the reminders due in its time window.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+    horizon = models.PositiveSmallIntegerField(default=1)
+    fire_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["fire_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "horizon"],
+                name="unique_reminder_per_horizon",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["fire_at"]),
+        ]
+
+    def __str__(self):
+        return f"Reminder for {self.content_type.model} #{self.object_id} at {self.fire_at}"
+
+
+def _project_due_date(project):
+    return field_value(project, "deadline")
+
+
+def _milestone_due_date(milestone):
+    return None if milestone.is_completed else field_value(milestone, "due_date")
+
+
+def _task_due_date(task):
+    return None if task.status == "DONE" else field_value(task, "due_date")
+
+
+def _service_due_date(service):
+    return field_value(service, "expiry_date")
+
+
+def _invoice_due_date(invoice):
+    if invoice.status not in ("SENT", "OVERDUE"):
+        return None
+    return field_value(invoice, "due_date")
+
+
+# Models that get reminders, mapped to a function returning the date the
+# reminder is for, or None when no reminder should exist
+REMINDER_SOURCES = {
+    Project: _project_due_date,
+    Milestone: _milestone_due_date,
+    Task: _task_due_date,
+    Service: _service_due_date,
+    Invoice: _invoice_due_date,
+}
+
+
+def reminder_horizons(model):
+    """
+    Days before the due date at which `model` objects are reminded about,
+    configured per model name in NOTIFICATION_HORIZONS.
+    """
+    horizons = getattr(settings, "NOTIFICATION_HORIZONS", {})
+    return sorted(set(horizons.get(model._meta.model_name, [1])), reverse=True)
+
+
+def horizon_dates(model, today):
+    """Due dates whose reminders fire on `today`, one per configured horizon."""
+    return [today + timedelta(days=horizon) for horizon in reminder_horizons(model)]
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def reminder_fire_at(due_date, horizon=1):
+    """Reminders fire at the start of the day `horizon` days before the due date."""
+    return start_of_day(due_date - timedelta(days=horizon))
+
+
+def schedule_reminder(instance):
+    """Creates, moves or removes the reminders for a source object."""
+    due_date = REMINDER_SOURCES[type(instance)](instance)
+    content_type = ContentType.objects.get_for_model(instance)
+    horizons = reminder_horizons(type(instance)) if due_date else []
+
+    ScheduledReminder.objects.filter(
+        content_type=content_type, object_id=instance.pk
+    ).exclude(horizon__in=horizons).delete()
+
+    for horizon in horizons:
+        ScheduledReminder.objects.update_or_create(
+            content_type=content_type,
+            object_id=instance.pk,
+            horizon=horizon,
+            defaults={"fire_at": reminder_fire_at(due_date, horizon)},
+        )
+
+
+def build_reminders(apps=None, horizons=True):
+    """
+    Returns unsaved reminders for every source object, one per configured
+    horizon. Migrations pass their `apps` to build them from historical
+    models, and `horizons=False` before reminders had a horizon.
+    """
+    content_types = migration_model(apps, ContentType).objects
+    reminder_model = migration_model(apps, ScheduledReminder)
+    reminders = []
+    for model, due_date_for in REMINDER_SOURCES.items():
+        source = migration_model(apps, model)
+        content_type = content_types.get_for_model(source)
+        for instance in source.objects.all().iterator():
+            due_date = due_date_for(instance)
+            if due_date is None:
+                continue
+            if not horizons:
+                reminders.append(
+                    reminder_model(
+                        content_type=content_type,
+                        object_id=instance.pk,
+                        fire_at=reminder_fire_at(due_date),
+                    )
+                )
+                continue
+            reminders.extend(
+                reminder_model(
+                    content_type=content_type,
+                    object_id=instance.pk,
+                    horizon=horizon,
+                    fire_at=reminder_fire_at(due_date, horizon),
+                )
+                for horizon in reminder_horizons(model)
+            )
+    return reminders
+
+
+def rebuild_reminders():
+    """Recreates every reminder from the source tables and returns the count."""
+    reminders = build_reminders()
+    ScheduledReminder.objects.all().delete()
+    ScheduledReminder.objects.bulk_create(reminders)
+    return len(reminders)
+
+
+def due_reminder_ids(day):
+    """
+    Returns {model: [object ids]} for the reminders firing on `day`,
+    read with a single range query on the fire_at index.
+    """
+    due_ids = defaultdict(list)
+    reminders = ScheduledReminder.objects.filter(
+        fire_at__gte=start_of_day(day),
+        fire_at__lt=start_of_day(day + timedelta(days=1)),
+    ).values_list("content_type_id", "object_id")
+    for content_type_id, object_id in reminders:
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        due_ids[model].append(object_id)
+    return due_ids
+
+
+def clear_past_reminders(day):
+    """Deletes reminders that fired before `day`."""
+    ScheduledReminder.objects.filter(fire_at__lt=start_of_day(day)).delete()
+
+
+def update_reminder(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_reminder(instance)
+
+
+def delete_reminder(sender, instance, **kwargs):
+    ScheduledReminder.objects.filter(
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=instance.pk,
+    ).delete()
+
+
+for model in REMINDER_SOURCES:
+    post_save.connect(update_reminder, sender=model)
+    post_delete.connect(delete_reminder, sender=model)
@@ -0,0 +1,135 @@
+import logging
+import os
+import random
+import socket
+import time
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from src.models.base import TimeStampedModel
+from src.models.finance import mark_overdue_invoices
+from src.models.notifications import (
+    check_and_send_notifications,
+    drain_pending_notifications,
+    prune_notifications,
+    refresh_status_counts,
+    retry_failed_notifications,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerJob(TimeStampedModel):
+    """
+    Run state of a periodic job executed by the `run_scheduler` command.
+    The row doubles as a lock, so only one scheduler instance runs a job
+    at a time even when several are deployed.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    next_run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=255, blank=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_duration = models.FloatField(
+        null=True, blank=True, help_text="Duration of the last run in seconds"
+    )
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+# Jobs the scheduler can run, by name. Intervals are set in SCHEDULER_JOBS.
+# The scan only queues notifications; the drain and retry sweep send them.
+JOBS = {
+    "notification_scan": partial(check_and_send_notifications, deliver=False),
+    "outbox_drain": drain_pending_notifications,
+    "retry_sweep": retry_failed_notifications,
+    "overdue_sweep": mark_overdue_invoices,
+    "notification_prune": prune_notifications,
+    "status_counts": refresh_status_counts,
+}
+
+
+def get_job_intervals():
+    """Returns {job name: interval in seconds} for the enabled jobs."""
+    intervals = getattr(settings, "SCHEDULER_JOBS", {})
+    return {name: interval for name, interval in intervals.items() if name in JOBS}
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _next_run(start, interval):
+    # Jitter spreads jobs of several instances and avoids synchronised bursts
+    jitter = getattr(settings, "SCHEDULER_JITTER", 0.1)
+    delay = interval * (1 + random.uniform(-jitter, jitter))
+    return start + timedelta(seconds=delay)
+
+
+def ensure_jobs():
+    """Creates the run state rows of all configured jobs."""
+    for name in get_job_intervals():
+        SchedulerJob.objects.get_or_create(name=name)
+
+
+def acquire_job(name, worker):
+    """
+    Locks a due job for `worker` with a single conditional UPDATE and returns
+    whether the lock was taken. Locks of crashed workers expire after
+    SCHEDULER_LOCK_TIMEOUT seconds.
+    """
+    now = timezone.now()
+    timeout = getattr(settings, "SCHEDULER_LOCK_TIMEOUT", 3600)
+    claimed = (
+        SchedulerJob.objects.filter(name=name, next_run_at__lte=now)
+        .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        .update(
+            locked_until=now + timedelta(seconds=timeout),
+            locked_by=worker,
+            last_started_at=now,
+        )
+    )
+    return claimed == 1
+
+
+def run_job(name, interval, worker):
+    """Runs a locked job, records its duration and releases the lock."""
+    start = timezone.now()
+    started = time.perf_counter()
+    error = ""
+    try:
+        JOBS[name]()
+    except Exception as e:
+        logger.exception(f"Scheduled job {name} failed")
+        error = str(e)
+
+    SchedulerJob.objects.filter(name=name, locked_by=worker).update(
+        next_run_at=_next_run(start, interval),
+        locked_until=None,
+        locked_by="",
+        last_duration=time.perf_counter() - started,
+        last_error=error,
+    )
+    return not error
+
+
+def run_due_jobs(worker=None):
+    """Runs every due job this worker can lock and returns their names."""
+    worker = worker or worker_name()
+    ran = []
+    for name, interval in get_job_intervals().items():
+        if acquire_job(name, worker):
+            run_job(name, interval, worker)
+            ran.append(name)
+    return ran
@@ -1,9 +1,11 @@
+from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
 from src.models.base import TimeStampedModel
 from src.models.clients import Client
+from src.models.versions import track_versions
 
 
 class Service(TimeStampedModel):
@@ -28,6 +30,8 @@ class Service(TimeStampedModel):
     start_date = models.DateField(null=True, blank=True)
     expiry_date = models.DateField(null=True, blank=True)
     auto_renew = models.BooleanField(default=False)
+    # Notifications sent about this object, newest first
+    notifications = GenericRelation("src.Notification")
 
     class Meta:
         ordering = ["-created_at"]
@@ -51,6 +55,9 @@ class Service(TimeStampedModel):
         return f"{self.get_service_type_display()} – {self.name}"
 
 
+track_versions(Service)
+
+
 class Credential(models.Model):
     service = models.ForeignKey(
         Service, on_delete=models.CASCADE, related_name="credentials"
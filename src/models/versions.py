@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+
+class ModelVersion(models.Model):
+    """
+    Version of a model, bumped whenever one of its rows is saved or deleted,
+    and the time of that change. Kept in the database rather than the cache,
+    so every web worker and the scheduler see the same versions, whatever
+    cache backend each process uses.
+    """
+
+    label = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    modified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["label"]
+
+    def __str__(self):
+        return f"{self.label} v{self.version}"
+
+
+def version_cache():
+    """Cache holding values stored under versioned keys."""
+    return caches[getattr(settings, "DASHBOARD_CACHE_ALIAS", "default")]
+
+
+def model_state(*models):
+    """
+    Returns the current version of each model and the time any of them last
+    changed, read in one query. Keys built from these versions change on
+    every edit, so cached values never need to be deleted. Models that never
+    changed have version 0 and no modification time.
+    """
+    if not models:
+        return [], None
+    labels = [model._meta.label_lower for model in models]
+    rows = {
+        label: (version, modified_at)
+        for label, version, modified_at in ModelVersion.objects.filter(
+            label__in=labels
+        ).values_list("label", "version", "modified_at")
+    }
+    versions = [rows.get(label, (0, None))[0] for label in labels]
+    modified = [row[1] for row in rows.values() if row[1]]
+    return versions, max(modified, default=None)
+
+
+def model_versions(*models):
+    """Returns the current version of each model."""
+    versions, _ = model_state(*models)
+    return versions
+
+
+def bump_version(model):
+    """Moves `model` to a new version once the current transaction commits."""
+    label = model._meta.label_lower
+
+    def bump():
+        now = timezone.now()
+        bumped = ModelVersion.objects.filter(label=label).update(
+            version=F("version") + 1, modified_at=now
+        )
+        if not bumped:
+            _, created = ModelVersion.objects.get_or_create(
+                label=label, defaults={"version": 1, "modified_at": now}
+            )
+            if not created:
+                # Another process created the row first
+                ModelVersion.objects.filter(label=label).update(
+                    version=F("version") + 1, modified_at=now
+                )
+
+    transaction.on_commit(bump)
+
+
+def _bump_on_change(sender, **kwargs):
+    bump_version(sender)
+
+
+def track_versions(*models, deletes=True):
+    """
+    Bumps the version of `models` whenever one of their rows changes. With
+    `deletes=False` only saves are tracked, which keeps queryset deletes of
+    large tables fast; their callers must bump the version themselves.
+    """
+    for model in models:
+        post_save.connect(_bump_on_change, sender=model)
+        if deletes:
+            post_delete.connect(_bump_on_change, sender=model)
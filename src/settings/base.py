@@ -118,5 +118,70 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# Cache (CACHE_URL, e.g. redis://127.0.0.1:6379/1; local memory by default)
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# Dashboard
+# Cache used for the computed dashboard context and the model versions
+DASHBOARD_CACHE_ALIAS = "default"
+# Upper bound in seconds; edits invalidate the cached context immediately
+DASHBOARD_CACHE_TIMEOUT = env.int("DASHBOARD_CACHE_TIMEOUT", default=3600)
+# Load dashboard panels from the async views; worthwhile under an ASGI server
+DASHBOARD_ASYNC = env.bool("DASHBOARD_ASYNC", default=False)
+# Per-panel overrides of DASHBOARD_CACHE_TIMEOUT, by panel name
+DASHBOARD_PANEL_TIMEOUTS = {
+    "stats": 300,
+    "finance": 300,
+    "recent_projects": 60,
+    "recent_tasks": 60,
+}
+
 # Tailwind CSS
 TAILWIND_CLI_USE_DAISY_UI = True
+
+# Notifications
+# Number of emails sent per mail connection before it is reopened
+NOTIFICATION_BATCH_SIZE = env.int("NOTIFICATION_BATCH_SIZE", default=50)
+# Sender threads used by the deliver_notifications worker
+NOTIFICATION_WORKERS = env.int("NOTIFICATION_WORKERS", default=4)
+# Maximum emails per second for the worker (0 means unlimited)
+NOTIFICATION_RATE_LIMIT = env.float("NOTIFICATION_RATE_LIMIT", default=0)
+# Failed emails are retried after 60s, 120s, 240s, ... up to the attempt limit
+NOTIFICATION_MAX_ATTEMPTS = env.int("NOTIFICATION_MAX_ATTEMPTS", default=5)
+NOTIFICATION_RETRY_BACKOFF = env.int("NOTIFICATION_RETRY_BACKOFF", default=60)
+# Days before the due date to send reminders, per model
+NOTIFICATION_HORIZONS = {
+    "project": [1],
+    "milestone": [1],
+    "task": [1],
+    "service": [7, 3, 1],
+    "invoice": [7, 3, 1],
+}
+# Combine each recipient's notifications of a run into a single email
+NOTIFICATION_DIGEST = env.bool("NOTIFICATION_DIGEST", default=False)
+# Sent notifications older than this many days are archived by
+# prune_notifications, in batches of NOTIFICATION_PRUNE_BATCH_SIZE rows
+NOTIFICATION_RETENTION_DAYS = env.int("NOTIFICATION_RETENTION_DAYS", default=90)
+NOTIFICATION_PRUNE_BATCH_SIZE = env.int("NOTIFICATION_PRUNE_BATCH_SIZE", default=1000)
+# Read dashboard status counts from counters maintained on every status change
+NOTIFICATION_STATUS_COUNTER = env.bool("NOTIFICATION_STATUS_COUNTER", default=False)
+# Store only the message template key and parameters of each notification
+# and render the body when it is sent, instead of storing the full text
+NOTIFICATION_STORE_TEMPLATES = env.bool("NOTIFICATION_STORE_TEMPLATES", default=False)
+# Processes that split the send_notifications scan by client
+NOTIFICATION_PROCESSES = env.int("NOTIFICATION_PROCESSES", default=1)
+
+# Scheduler (run_scheduler command)
+# Seconds between runs of each periodic job; remove a job to disable it
+SCHEDULER_JOBS = {
+    "notification_scan": env.int("SCHEDULER_SCAN_INTERVAL", default=3600),
+    "outbox_drain": env.int("SCHEDULER_DRAIN_INTERVAL", default=60),
+    "retry_sweep": env.int("SCHEDULER_RETRY_INTERVAL", default=300),
+    "overdue_sweep": env.int("SCHEDULER_OVERDUE_INTERVAL", default=3600),
+    "notification_prune": env.int("SCHEDULER_PRUNE_INTERVAL", default=86400),
+    "status_counts": env.int("SCHEDULER_COUNTS_INTERVAL", default=3600),
+}
+# Random +/- fraction applied to each interval
+SCHEDULER_JITTER = 0.1
+# Seconds after which the lock of a crashed scheduler instance expires
+SCHEDULER_LOCK_TIMEOUT = 3600
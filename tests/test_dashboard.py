@@ -0,0 +1,349 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from src.models.clients import Client
+from src.models.dashboard import (
+    ASYNC_DASHBOARD_PANELS,
+    DASHBOARD_PANELS,
+    afinance_overview,
+    finance_overview,
+    panel_timeout,
+)
+from src.models.finance import (
+    DailyFinanceSnapshot,
+    Expense,
+    Invoice,
+    finance_totals,
+    mark_overdue_invoices,
+    rebuild_finance_snapshots,
+)
+from src.models.productivity import Note
+from src.models.projects import Project, Task
+from src.models.services import Service
+from src.models.versions import version_cache
+
+User = get_user_model()
+
+
+class DashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "password"
+        )
+        today = timezone.localdate()
+        for i in range(3):
+            client = Client.objects.create(
+                name=f"Client {i}", email=f"client{i}@example.com"
+            )
+            project = Project.objects.create(
+                name=f"Project {i}",
+                client=client,
+                status="IN_PROGRESS",
+                deadline=today + timedelta(days=3),
+            )
+            Task.objects.create(project=project, title=f"Task {i}")
+            Service.objects.create(
+                client=client,
+                name=f"site{i}.com",
+                service_type="DOMAIN",
+                expiry_date=today + timedelta(days=10),
+            )
+            for status in ("PAID", "SENT", "OVERDUE"):
+                Invoice.objects.create(
+                    client=client,
+                    project=project,
+                    amount=Decimal("100.00"),
+                    due_date=today,
+                    status=status,
+                )
+        Expense.objects.create(
+            description="Hosting", amount=Decimal("25.00"), date=today
+        )
+
+    def setUp(self):
+        version_cache().clear()
+        self.client.force_login(self.admin)
+
+    def get_panel(self, panel):
+        return self.client.get(reverse("dashboard_panel", args=[panel]))
+
+    def test_dashboard_metrics(self):
+        stats = self.get_panel("stats").context
+        finance = self.get_panel("finance").context
+
+        self.assertEqual(stats["total_clients"], 3)
+        self.assertEqual(stats["active_projects"], 3)
+        self.assertEqual(stats["pending_tasks"], 3)
+        self.assertEqual(stats["total_income"], Decimal("300.00"))
+        self.assertEqual(finance["pending_income"], Decimal("300.00"))
+        self.assertEqual(finance["monthly_expenses"], Decimal("25.00"))
+        self.assertEqual(finance["overdue_invoices"], 3)
+
+    def test_shell_loads_panels_lazily(self):
+        # The page itself only reads the session and user
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("dashboard"))
+
+        for panel in DASHBOARD_PANELS:
+            self.assertContains(
+                response, reverse("dashboard_panel", args=[panel]), count=1
+            )
+            self.assertEqual(self.get_panel(panel).status_code, 200)
+        self.assertEqual(self.get_panel("unknown").status_code, 404)
+
+    def test_panel_query_count(self):
+        # Session, user, model versions, three counts and the finance
+        # snapshot aggregate
+        with self.assertNumQueries(7):
+            self.get_panel("stats")
+
+        # Repeat loads only read the session, user and model versions
+        with self.assertNumQueries(3):
+            self.get_panel("stats")
+
+    def test_edits_invalidate_only_affected_panels(self):
+        self.get_panel("finance")
+        self.get_panel("expiring_services")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Invoice.objects.filter(status="SENT").first().delete()
+        response = self.get_panel("finance")
+        self.assertEqual(response.context["pending_income"], Decimal("200.00"))
+        with self.assertNumQueries(3):
+            self.get_panel("expiring_services")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_overdue_invoices(today=timezone.localdate() + timedelta(days=1))
+        response = self.get_panel("finance")
+        self.assertEqual(response.context["overdue_invoices"], 5)
+
+    @override_settings(DASHBOARD_PANEL_TIMEOUTS={"recent_tasks": 5})
+    def test_panel_timeouts(self):
+        self.assertEqual(panel_timeout("recent_tasks"), 5)
+        self.assertEqual(
+            panel_timeout("expiring_services"), settings.DASHBOARD_CACHE_TIMEOUT
+        )
+
+    async def test_async_panels_match_sync(self):
+        today = timezone.localdate()
+        for name, (compute, _) in DASHBOARD_PANELS.items():
+            expected = await sync_to_async(compute)(today)
+            self.assertEqual(await ASYNC_DASHBOARD_PANELS[name](today), expected)
+        self.assertEqual(
+            await afinance_overview(), await sync_to_async(finance_overview)()
+        )
+
+    async def test_async_views(self):
+        await self.async_client.aforce_login(self.admin)
+
+        response = await self.async_client.get(
+            reverse("dashboard_panel_async", args=["stats"])
+        )
+        self.assertEqual(response.context["total_clients"], 3)
+        self.assertEqual(response.context["total_income"], Decimal("300.00"))
+
+        response = await self.async_client.get(reverse("finance_dashboard_async"))
+        self.assertEqual(response.context["pending_income"], Decimal("600.00"))
+        self.assertEqual(len(response.context["invoices"]), 5)
+
+    @override_settings(DASHBOARD_ASYNC=True)
+    def test_shell_uses_async_panels(self):
+        response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, reverse("dashboard_panel_async", args=["stats"]))
+
+
+class FinanceSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        cls.client_obj = Client.objects.create(
+            name="Client", email="client@example.com"
+        )
+        cls.project = Project.objects.create(name="Project", client=cls.client_obj)
+
+    def create_invoice(self, status, amount="100.00"):
+        return Invoice.objects.create(
+            client=self.client_obj,
+            project=self.project,
+            amount=amount,
+            due_date=self.today,
+            status=status,
+        )
+
+    def snapshot_rows(self):
+        return list(
+            DailyFinanceSnapshot.objects.order_by("date", "category").values_list(
+                "date",
+                "category",
+                "income",
+                "pending",
+                "overdue",
+                "overdue_count",
+                "expenses",
+            )
+        )
+
+    def assertMatchesRebuild(self):
+        # Incremental updates must leave the same rows a full rebuild writes
+        incremental = self.snapshot_rows()
+        rebuild_finance_snapshots()
+        rebuilt = [row for row in self.snapshot_rows() if any(row[2:])]
+        self.assertEqual([row for row in incremental if any(row[2:])], rebuilt)
+
+    def test_invoice_status_changes_move_amounts(self):
+        invoice = self.create_invoice("DRAFT")
+        self.assertEqual(finance_totals()["pending_income"], 0)
+
+        invoice.status = "SENT"
+        invoice.save()
+        self.assertEqual(finance_totals()["pending_income"], Decimal("100.00"))
+
+        # Edits assign raw form values and are re-read from the database
+        invoice = Invoice.objects.get(pk=invoice.pk)
+        invoice.amount = "150.00"
+        invoice.status = "PAID"
+        invoice.save()
+        totals = finance_totals()
+        self.assertEqual(totals["pending_income"], 0)
+        self.assertEqual(totals["total_income"], Decimal("150.00"))
+
+        invoice.delete()
+        self.assertEqual(finance_totals()["total_income"], 0)
+        self.assertMatchesRebuild()
+
+    def test_partly_loaded_rows_move_their_stored_amount(self):
+        invoice = self.create_invoice("PAID", amount="75.50")
+
+        invoice = Invoice.objects.only("status").get(pk=invoice.pk)
+        invoice.status = "SENT"
+        invoice.save()
+        totals = finance_totals()
+        self.assertEqual(totals["total_income"], 0)
+        self.assertEqual(totals["pending_income"], Decimal("75.50"))
+
+        Invoice.objects.only("status").get(pk=invoice.pk).delete()
+        self.assertEqual(finance_totals()["pending_income"], 0)
+        self.assertMatchesRebuild()
+
+    def test_expenses_bucket_by_day_and_category(self):
+        old = Expense.objects.create(
+            description="Laptop",
+            amount=Decimal("900.00"),
+            date=self.today - timedelta(days=40),
+            category="Hardware",
+        )
+        Expense.objects.create(
+            description="Hosting",
+            amount=Decimal("25.00"),
+            date=self.today,
+            category="Hosting",
+        )
+        totals = finance_totals(expenses_since=self.today - timedelta(days=30))
+        self.assertEqual(totals["total_expenses"], Decimal("925.00"))
+        self.assertEqual(totals["period_expenses"], Decimal("25.00"))
+
+        old.date = self.today
+        old.category = "Hosting"
+        old.save()
+        snapshot = DailyFinanceSnapshot.objects.get(date=self.today, category="Hosting")
+        self.assertEqual(snapshot.expenses, Decimal("925.00"))
+        self.assertMatchesRebuild()
+
+    def test_mark_overdue_moves_pending_amounts(self):
+        self.create_invoice("SENT")
+        self.create_invoice("SENT", amount="50.00")
+
+        mark_overdue_invoices(today=self.today + timedelta(days=1))
+
+        totals = finance_totals()
+        self.assertEqual(totals["pending_income"], 0)
+        self.assertEqual(totals["overdue_income"], Decimal("150.00"))
+        self.assertEqual(totals["overdue_invoices"], 2)
+        self.assertMatchesRebuild()
+
+    def test_rebuild_restores_bulk_changes(self):
+        self.create_invoice("PAID")
+        # update() bypasses the signals that maintain the snapshots
+        Invoice.objects.update(amount=Decimal("80.00"))
+        self.assertEqual(finance_totals()["total_income"], Decimal("100.00"))
+
+        self.assertEqual(rebuild_finance_snapshots(), 1)
+        self.assertEqual(finance_totals()["total_income"], Decimal("80.00"))
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "password"
+        )
+        Client.objects.create(name="Client", email="client@example.com")
+
+    def setUp(self):
+        version_cache().clear()
+
+    def test_unchanged_list_answers_304_without_queries(self):
+        # The first visit sets the CSRF cookie the page embeds
+        self.client.get(reverse("client_list"))
+        response = self.client.get(reverse("client_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        # Only the model versions are read
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("client_list"), HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_last_modified(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Note.objects.create(title="Note", content="Content")
+        response = self.client.get(reverse("note_list"))
+
+        response = self.client.get(
+            reverse("note_list"), HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_edits_change_etag(self):
+        etag = self.client.get(reverse("project_list"))["ETag"]
+
+        # Projects list their client's name, so client edits count too
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.get().save()
+        response = self.client.get(reverse("project_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_versions_are_not_kept_in_the_cache(self):
+        # Other processes have their own local-memory cache, so versions
+        # must survive it being emptied
+        with self.captureOnCommitCallbacks(execute=True):
+            Client.objects.get().save()
+        self.client.get(reverse("client_list"))
+        etag = self.client.get(reverse("client_list"))["ETag"]
+
+        version_cache().clear()
+        response = self.client.get(reverse("client_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_dashboard_panels(self):
+        self.client.force_login(self.admin)
+        url = reverse("dashboard_panel", args=["stats"])
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # HTMX and plain requests get separate validators
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, HTTP_HX_REQUEST="true")
+        self.assertEqual(response.status_code, 200)
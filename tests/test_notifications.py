@@ -1,16 +1,51 @@
+from concurrent.futures import Future
 from datetime import timedelta
 from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.template import Engine
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from django.utils import timezone
 
 from src.models.clients import Client
 from src.models.finance import Invoice
-from src.models.notifications import Notification, check_and_send_notifications
+from src.models.notifications import (
+    Notification,
+    NotificationArchive,
+    NotificationRun,
+    NotificationStatusCount,
+    RunStats,
+    check_and_send_notifications,
+    create_and_send,
+    created_on,
+    drain_pending_notifications,
+    prune_notifications,
+    retry_failed_notifications,
+    send_sharded_notifications,
+    status_counts,
+)
 from src.models.productivity import TimeEntry
 from src.models.projects import Milestone, Project, Task
+from src.models.reminders import (
+    ScheduledReminder,
+    rebuild_reminders,
+    reminder_fire_at,
+)
+from src.models.scheduler import (
+    SchedulerJob,
+    acquire_job,
+    ensure_jobs,
+    run_due_jobs,
+)
 from src.models.services import Service
 
 User = get_user_model()
@@ -124,3 +159,776 @@ class NotificationTests(TestCase):
                     subject__contains="Time Entry Logged"
                 ).exists()
             )
+
+    def test_run_reuses_connection_per_batch(self):
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            for i in range(3):
+                Project.objects.create(
+                    name=f"Project {i}", client=self.client, deadline=self.tomorrow
+                )
+            with mock.patch.object(EmailBackend, "open") as mock_open:
+                check_and_send_notifications(batch_size=4)
+
+            # 6 emails in batches of 4 -> 2 connections
+            self.assertEqual(len(mail.outbox), 6)
+            self.assertEqual(mock_open.call_count, 2)
+            self.assertEqual(Notification.objects.filter(status="SENT").count(), 6)
+
+    def test_failed_message_does_not_affect_rest_of_batch(self):
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            Project.objects.create(
+                name="Test Project", client=self.client, deadline=self.tomorrow
+            )
+            send_messages = EmailBackend.send_messages
+
+            def flaky_send(backend, messages):
+                if messages[0].to == ["client@example.com"]:
+                    raise ConnectionError("Connection dropped")
+                return send_messages(backend, messages)
+
+            with mock.patch.object(
+                EmailBackend, "send_messages", autospec=True, side_effect=flaky_send
+            ):
+                check_and_send_notifications()
+
+            self.assertEqual(
+                Notification.objects.get(recipient="client@example.com").status,
+                "FAILED",
+            )
+            sent = Notification.objects.get(recipient="admin@example.com")
+            self.assertEqual(sent.status, "SENT")
+            self.assertIsNotNone(sent.sent_at)
+
+    def test_rerun_on_same_day_skips_sent_notifications(self):
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            project = Project.objects.create(
+                name="Test Project", client=self.client, deadline=self.tomorrow
+            )
+            Task.objects.create(
+                project=project, title="Test Task", due_date=self.tomorrow
+            )
+            check_and_send_notifications()
+            self.assertEqual(len(mail.outbox), 3)
+
+            Project.objects.create(
+                name="New Project", client=self.client, deadline=self.tomorrow
+            )
+            check_and_send_notifications()
+
+            # Only the new project's client + admin emails go out
+            self.assertEqual(len(mail.outbox), 5)
+            self.assertEqual(Notification.objects.count(), 5)
+
+    def test_notification_rows_are_written_in_bulk(self):
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            for i in range(10):
+                Project.objects.create(
+                    name=f"Project {i}", client=self.client, deadline=self.tomorrow
+                )
+            with CaptureQueriesContext(connection) as ctx:
+                check_and_send_notifications()
+
+            writes = [
+                q["sql"]
+                for q in ctx.captured_queries
+                if q["sql"].startswith(("INSERT", "UPDATE"))
+                and "src_notification" in q["sql"]
+            ]
+            # One INSERT for the run and one UPDATE for the SENT outcome
+            self.assertEqual(len(writes), 2)
+            self.assertEqual(Notification.objects.filter(status="SENT").count(), 20)
+
+    def test_queued_notifications_are_drained_by_worker(self):
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            for i in range(5):
+                Project.objects.create(
+                    name=f"Project {i}", client=self.client, deadline=self.tomorrow
+                )
+            check_and_send_notifications(deliver=False)
+
+            self.assertEqual(len(mail.outbox), 0)
+            self.assertEqual(Notification.objects.filter(status="PENDING").count(), 10)
+
+            processed = drain_pending_notifications(batch_size=3, workers=2)
+
+        self.assertEqual(processed, 10)
+        self.assertEqual(len(mail.outbox), 10)
+        self.assertEqual(Notification.objects.filter(status="SENT").count(), 10)
+        self.assertEqual(drain_pending_notifications(), 0)
+
+    def test_workers_skip_notifications_delivered_inline(self):
+        deliver = NotificationRun.deliver
+
+        def drain_then_deliver(run, **kwargs):
+            # A queue worker running between the insert and the delivery
+            self.assertEqual(drain_pending_notifications(), 0)
+            deliver(run, **kwargs)
+
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            Project.objects.create(
+                name="Test Project", client=self.client, deadline=self.tomorrow
+            )
+            with mock.patch.object(NotificationRun, "deliver", drain_then_deliver):
+                check_and_send_notifications()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(Notification.objects.filter(status="SENT").count(), 2)
+
+    def test_failed_notification_is_retried_with_backoff(self):
+        Service.objects.create(
+            client=self.client,
+            name="Test Service",
+            service_type="DOMAIN",
+            expiry_date=self.tomorrow,
+        )
+        with self.settings(NOTIFICATION_MAX_ATTEMPTS=2, NOTIFICATION_RETRY_BACKOFF=60):
+            with mock.patch.object(
+                EmailBackend, "send_messages", side_effect=ConnectionError("down")
+            ):
+                check_and_send_notifications()
+
+            notification = Notification.objects.get()
+            self.assertEqual(notification.status, "FAILED")
+            self.assertEqual(notification.attempts, 1)
+            self.assertEqual(notification.last_error, "down")
+            self.assertGreater(notification.next_attempt_at, timezone.now())
+
+            # Not due yet
+            self.assertEqual(retry_failed_notifications(), 0)
+
+            Notification.objects.update(next_attempt_at=timezone.now())
+            with mock.patch.object(
+                EmailBackend, "send_messages", side_effect=ConnectionError("down")
+            ):
+                self.assertEqual(retry_failed_notifications(), 1)
+
+            # Attempts exhausted, no further retries are scheduled
+            notification.refresh_from_db()
+            self.assertEqual(notification.attempts, 2)
+            self.assertIsNone(notification.next_attempt_at)
+            self.assertEqual(retry_failed_notifications(), 0)
+
+    def test_due_retry_is_sent(self):
+        notification = Notification.objects.create(
+            recipient="client@example.com",
+            subject="Retry me",
+            message="Hello",
+            status="FAILED",
+            attempts=1,
+            next_attempt_at=timezone.now() - timedelta(minutes=1),
+        )
+        self.assertEqual(retry_failed_notifications(), 1)
+
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, "SENT")
+        self.assertEqual(notification.attempts, 2)
+        self.assertIsNone(notification.next_attempt_at)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_old_sent_notifications_are_archived_in_batches(self):
+        project = Project.objects.create(name="Archived", client=self.client)
+        for status in ["SENT", "SENT", "SENT", "FAILED"]:
+            Notification.objects.create(
+                recipient="client@example.com",
+                subject="Old",
+                message="Body",
+                status=status,
+                content_object=project,
+            )
+        recent = Notification.objects.create(
+            recipient="client@example.com", subject="Recent", status="SENT"
+        )
+        Notification.objects.exclude(pk=recent.pk).update(
+            created_at=timezone.now() - timedelta(days=100)
+        )
+
+        with self.assertNumQueries(13):
+            # 2 batches of 2 and 1 row plus the empty final select
+            pruned = prune_notifications(days=90, batch_size=2)
+
+        self.assertEqual(pruned, 3)
+        self.assertEqual(
+            sorted(Notification.objects.values_list("status", flat=True)),
+            ["FAILED", "SENT"],
+        )
+        archived = NotificationArchive.objects.first()
+        self.assertEqual(archived.subject, "Old")
+        self.assertEqual(archived.content_object, project)
+        self.assertEqual(NotificationArchive.objects.count(), 3)
+
+    def test_dashboard_counts_statuses_in_one_query(self):
+        for status in ["PENDING", "SENT", "SENT", "FAILED"]:
+            Notification.objects.create(
+                recipient="client@example.com", subject="Hi", status=status
+            )
+
+        with self.assertNumQueries(1):
+            counts = status_counts()
+        self.assertEqual(counts, {"PENDING": 1, "SENDING": 0, "SENT": 2, "FAILED": 1})
+
+        response = self.client_class().get(reverse("notifications_dashboard"))
+        self.assertEqual(response.context["sent_count"], 2)
+
+    def test_status_counter_follows_status_changes(self):
+        with self.settings(
+            NOTIFICATION_STATUS_COUNTER=True,
+            ADMINS=[("Admin", "admin@example.com")],
+        ):
+            Project.objects.create(
+                name="Test Project", client=self.client, deadline=self.tomorrow
+            )
+            check_and_send_notifications(deliver=False)
+            self.assertEqual(status_counts()["PENDING"], 2)
+
+            drain_pending_notifications()
+            Notification.objects.update(created_at=timezone.now() - timedelta(days=100))
+            prune_notifications(days=90)
+            create_and_send("client@example.com", "Hello", "Body")
+
+            with self.assertNumQueries(1):
+                counts = status_counts()
+            self.assertEqual(
+                counts, {"PENDING": 0, "SENDING": 0, "SENT": 1, "FAILED": 0}
+            )
+            self.assertEqual(
+                NotificationStatusCount.objects.get(status="SENT").count, 1
+            )
+
+    def add_source_notifications(self, count):
+        for i in range(count):
+            project = Project.objects.create(name=f"Project {i}", client=self.client)
+            service = Service.objects.create(
+                client=self.client, name=f"site{i}.com", service_type="DOMAIN"
+            )
+            for obj in (project, service):
+                Notification.objects.create(
+                    recipient="client@example.com",
+                    subject=f"About {obj}",
+                    content_object=obj,
+                )
+
+    def count_page_queries(self, browser, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = browser.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_notification_sources_are_resolved_in_bulk(self):
+        browser = self.client_class()
+        browser.force_login(self.admin)
+        urls = [reverse("notification_list"), "/admin/src/notification/"]
+
+        self.add_source_notifications(2)
+        baseline = [self.count_page_queries(browser, url) for url in urls]
+        self.add_source_notifications(10)
+        self.assertEqual(
+            [self.count_page_queries(browser, url) for url in urls], baseline
+        )
+
+        response = browser.get(reverse("notification_list"))
+        project = Project.objects.filter(name="Project 0").first()
+        self.assertContains(response, reverse("project_detail", args=[project.pk]))
+        self.assertContains(response, "/admin/src/service/")
+
+    def test_notification_history_is_prefetched(self):
+        browser = self.client_class()
+        browser.force_login(self.admin)
+        urls = [reverse("invoice_list"), "/admin/src/service/"]
+
+        def add_reminded_objects(count):
+            for _ in range(count):
+                project = Project.objects.create(name="Project", client=self.client)
+                invoice = Invoice.objects.create(
+                    client=self.client,
+                    project=project,
+                    amount=Decimal("100.00"),
+                    due_date=self.tomorrow,
+                )
+                service = Service.objects.create(
+                    client=self.client, name="site.com", service_type="DOMAIN"
+                )
+                for obj in (project, invoice, service):
+                    Notification.objects.create(
+                        recipient="client@example.com",
+                        subject=f"Reminder for {obj}",
+                        status="SENT",
+                        sent_at=timezone.now(),
+                        content_object=obj,
+                    )
+            return project
+
+        add_reminded_objects(2)
+        baseline = [self.count_page_queries(browser, url) for url in urls]
+        project = add_reminded_objects(10)
+        self.assertEqual(
+            [self.count_page_queries(browser, url) for url in urls], baseline
+        )
+
+        response = browser.get(reverse("project_detail", args=[project.pk]))
+        self.assertContains(response, f"Reminder for {project}")
+
+    def test_message_is_rendered_from_template(self):
+        self.client.name = "O'Brien & Co"
+        self.client.save()
+        project = Project.objects.create(
+            name="Test Project", client=self.client, deadline=self.tomorrow
+        )
+        check_and_send_notifications()
+
+        notification = Notification.objects.get(recipient="client@example.com")
+        self.assertEqual(notification.template, "project_client")
+        self.assertEqual(
+            notification.message,
+            f"Dear O'Brien & Co,\n\nThe project '{project.name}' is due on "
+            f"{self.tomorrow}.\n\nRegards,\nDevSuite",
+        )
+        self.assertIsNone(notification.params)
+
+    def test_stored_template_is_rendered_when_sent(self):
+        Project.objects.create(
+            name="Test Project", client=self.client, deadline=self.tomorrow
+        )
+        with self.settings(NOTIFICATION_STORE_TEMPLATES=True):
+            check_and_send_notifications(deliver=False)
+            notification = Notification.objects.get(recipient="client@example.com")
+            self.assertEqual(notification.message, "")
+            self.assertEqual(notification.params["project"], "Test Project")
+
+            drain_pending_notifications()
+
+        (email,) = [m for m in mail.outbox if m.to == ["client@example.com"]]
+        self.assertEqual(email.body, notification.body)
+        self.assertIn("The project 'Test Project' is due on", email.body)
+
+    def test_unknown_stored_template_fails_only_its_notification(self):
+        for name in ["Project A", "Project B"]:
+            Project.objects.create(
+                name=name, client=self.client, deadline=self.tomorrow
+            )
+        with self.settings(NOTIFICATION_STORE_TEMPLATES=True):
+            check_and_send_notifications(deliver=False)
+        Notification.objects.filter(
+            recipient="client@example.com", params__project="Project A"
+        ).update(template="removed_template")
+
+        drain_pending_notifications(workers=1)
+
+        failed = Notification.objects.get(status="FAILED")
+        self.assertEqual(failed.params["project"], "Project A")
+        self.assertIn("removed_template", failed.last_error)
+        # The rest of the batch is still sent and recorded
+        self.assertEqual(Notification.objects.filter(status="SENT").count(), 3)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_templates_are_compiled_once_per_run(self):
+        for i in range(3):
+            Project.objects.create(
+                name=f"Project {i}", client=self.client, deadline=self.tomorrow
+            )
+        with mock.patch(
+            "django.template.Engine.get_template",
+            wraps=Engine.get_default().get_template,
+        ) as get_template:
+            check_and_send_notifications(dry_run=True)
+
+        # Subject and body of the project_client and project_admin messages
+        self.assertEqual(get_template.call_count, 4)
+
+    def test_benchmark_sends_to_local_sink_and_rolls_back(self):
+        out = StringIO()
+        call_command("benchmark_notifications", clients=3, stdout=out)
+
+        # Per client: project (client and admin), invoice and service
+        self.assertIn("Emails received: 12  Failed: 0", out.getvalue())
+        self.assertIn("emails/s during delivery", out.getvalue())
+        self.assertEqual(Client.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_digest_sends_one_email_per_recipient(self):
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            project = Project.objects.create(
+                name="Test Project", client=self.client, deadline=self.tomorrow
+            )
+            Milestone.objects.create(
+                project=project, title="Test Milestone", due_date=self.tomorrow
+            )
+            Task.objects.create(
+                project=project, title="Test Task", due_date=self.tomorrow
+            )
+            check_and_send_notifications(digest=True)
+
+        # 5 notifications, but only one email each for the client and admin
+        self.assertEqual(len(mail.outbox), 2)
+        admin_email = next(m for m in mail.outbox if m.to == ["admin@example.com"])
+        self.assertIn("Task Due: Test Task", admin_email.body)
+        self.assertIn("Milestone Due - Test Milestone", admin_email.body)
+        self.assertEqual(Notification.objects.filter(status="SENT").count(), 5)
+
+    def test_drained_notifications_are_sent_as_digests(self):
+        with self.settings(
+            ADMINS=[("Admin", "admin@example.com")], NOTIFICATION_DIGEST=True
+        ):
+            project = Project.objects.create(
+                name="Test Project", client=self.client, deadline=self.tomorrow
+            )
+            Task.objects.create(
+                project=project, title="Test Task", due_date=self.tomorrow
+            )
+            check_and_send_notifications(deliver=False)
+            drain_pending_notifications(workers=2)
+
+        # The admin's two notifications share one email
+        self.assertEqual(len(mail.outbox), 2)
+        admin_email = next(m for m in mail.outbox if m.to == ["admin@example.com"])
+        self.assertIn("Task Due: Test Task", admin_email.body)
+        self.assertEqual(Notification.objects.filter(status="SENT").count(), 3)
+
+    def test_queue_rejects_digest(self):
+        with self.assertRaisesMessage(CommandError, "deliver_notifications --digest"):
+            call_command("send_notifications", queue=True, digest=True)
+        self.assertFalse(Notification.objects.exists())
+
+
+class ScheduledReminderTests(TestCase):
+    def setUp(self):
+        self.client = Client.objects.create(
+            name="Test Client", email="client@example.com"
+        )
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def test_reminder_follows_project_deadline(self):
+        project = Project.objects.create(
+            name="Test Project", client=self.client, deadline=self.tomorrow
+        )
+        reminder = ScheduledReminder.objects.get()
+        self.assertEqual(reminder.content_object, project)
+        self.assertEqual(reminder.fire_at, reminder_fire_at(self.tomorrow))
+
+        project.deadline = self.tomorrow + timedelta(days=5)
+        project.save()
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.fire_at, reminder_fire_at(project.deadline))
+
+        project.delete()
+        self.assertFalse(ScheduledReminder.objects.exists())
+
+    def test_reminder_removed_when_completed(self):
+        project = Project.objects.create(name="Test Project", client=self.client)
+        milestone = Milestone.objects.create(
+            project=project, title="Test Milestone", due_date=self.tomorrow
+        )
+        self.assertEqual(ScheduledReminder.objects.count(), 1)
+
+        milestone.is_completed = True
+        milestone.save()
+        self.assertFalse(ScheduledReminder.objects.exists())
+
+    def test_invoice_reminder_depends_on_status(self):
+        project = Project.objects.create(name="Test Project", client=self.client)
+        invoice = Invoice.objects.create(
+            client=self.client,
+            project=project,
+            amount=Decimal("100.00"),
+            due_date=str(self.tomorrow),
+        )
+        self.assertFalse(ScheduledReminder.objects.exists())
+
+        invoice.status = "SENT"
+        invoice.save()
+        # One reminder per configured horizon
+        self.assertEqual(ScheduledReminder.objects.count(), 3)
+
+        invoice.status = "PAID"
+        invoice.save()
+        self.assertFalse(ScheduledReminder.objects.exists())
+
+    def test_scan_only_reads_scheduled_objects(self):
+        Service.objects.create(
+            client=self.client,
+            name="Test Service",
+            service_type="DOMAIN",
+            expiry_date=self.tomorrow,
+        )
+        ScheduledReminder.objects.all().delete()
+        check_and_send_notifications()
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(rebuild_reminders(), 3)
+        check_and_send_notifications()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_reminders_fire_for_each_horizon(self):
+        today = timezone.localdate()
+        with self.settings(NOTIFICATION_HORIZONS={"service": [7, 3, 1]}):
+            for days in (1, 3, 5, 7):
+                Service.objects.create(
+                    client=self.client,
+                    name=f"service{days}.com",
+                    service_type="DOMAIN",
+                    expiry_date=today + timedelta(days=days),
+                )
+            check_and_send_notifications()
+
+        subjects = sorted(m.subject for m in mail.outbox)
+        self.assertEqual(
+            subjects,
+            [
+                "Service Expiry Warning: service1.com",
+                "Service Expiry Warning: service3.com (in 3 days)",
+                "Service Expiry Warning: service7.com (in 7 days)",
+            ],
+        )
+
+    def test_changing_horizons_replaces_reminders(self):
+        project = Project.objects.create(
+            name="Test Project", client=self.client, deadline=self.tomorrow
+        )
+        with self.settings(NOTIFICATION_HORIZONS={"project": [14, 1]}):
+            project.save()
+        self.assertEqual(
+            sorted(ScheduledReminder.objects.values_list("horizon", flat=True)),
+            [1, 14],
+        )
+
+        project.save()
+        self.assertEqual(
+            list(ScheduledReminder.objects.values_list("horizon", flat=True)), [1]
+        )
+
+
+class NotificationQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        now = timezone.now()
+        for i in range(40):
+            client = Client.objects.create(
+                name=f"Client {i}", email=f"client{i}@example.com"
+            )
+            project = Project.objects.create(
+                name=f"Project {i}", client=client, deadline=tomorrow
+            )
+            Milestone.objects.create(
+                project=project, title=f"Milestone {i}", due_date=tomorrow
+            )
+            Task.objects.create(project=project, title=f"Task {i}", due_date=tomorrow)
+            Service.objects.create(
+                client=client,
+                name=f"service{i}.com",
+                service_type="DOMAIN",
+                expiry_date=tomorrow,
+            )
+            Invoice.objects.create(
+                client=client,
+                project=project,
+                amount=Decimal("100.00"),
+                due_date=tomorrow,
+                status="SENT",
+            )
+            TimeEntry.objects.create(
+                project=project,
+                description=f"Work {i}",
+                start_time=now - timedelta(hours=2),
+                end_time=now - timedelta(hours=1),
+            )
+
+    def test_scan_runs_in_constant_number_of_queries(self):
+        ContentType.objects.clear_cache()
+        # Bulk writes are chunked by the database's parameter limit, so only
+        # the scan is pinned here; see test_notification_rows_are_written_in_bulk
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            # sent keys, content types, due reminders, 6 category scans and
+            # notified time entries
+            with self.assertNumQueries(10):
+                notifications = check_and_send_notifications(dry_run=True)
+
+        self.assertEqual(len(notifications), 320)
+
+    def test_shards_partition_the_run(self):
+        def keys(notifications):
+            return {(n.recipient, n.subject) for n in notifications}
+
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            expected = keys(check_and_send_notifications(dry_run=True))
+            shards = [
+                keys(check_and_send_notifications(dry_run=True, shard=(i, 3)))
+                for i in range(3)
+            ]
+
+        self.assertEqual(set().union(*shards), expected)
+        self.assertEqual(sum(len(shard) for shard in shards), len(expected))
+
+    def test_sharded_run_merges_stats(self):
+        stats = RunStats()
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            with mock.patch(
+                "src.models.notifications.ProcessPoolExecutor", InlineExecutor
+            ):
+                total = send_sharded_notifications(processes=3, stats=stats)
+
+        # 40 clients: 2 per project and milestone, 1 per task, service,
+        # invoice and time entry
+        self.assertEqual(total, 320)
+        self.assertEqual(stats.total("sent"), 320)
+        self.assertEqual(stats.categories["project"]["scanned"], 40)
+        self.assertEqual(len(mail.outbox), 320)
+
+    def test_dry_run_reports_stats_without_writing(self):
+        stats = RunStats()
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            check_and_send_notifications(dry_run=True, stats=stats)
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            stats.categories["project"],
+            {
+                "scanned": 40,
+                "generated": 80,
+                "deduplicated": 0,
+                "sent": 0,
+                "failed": 0,
+            },
+        )
+        self.assertEqual(stats.categories["timeentry"]["generated"], 40)
+        self.assertEqual(set(stats.phases), {"setup", "scan"})
+        self.assertEqual(stats.phases["scan"]["queries"], 8)
+
+    def test_stats_count_sent_and_deduplicated(self):
+        with self.settings(ADMINS=[("Admin", "admin@example.com")]):
+            first = RunStats()
+            check_and_send_notifications(stats=first)
+            second = RunStats()
+            check_and_send_notifications(stats=second)
+
+        self.assertEqual(first.total("sent"), 320)
+        self.assertEqual(first.total("failed"), 0)
+        # Project deadlines go to the client and the admin
+        self.assertEqual(first.categories["project"]["sent"], 80)
+        self.assertEqual(first.categories["timeentry"]["sent"], 40)
+        self.assertEqual(set(first.phases), {"setup", "scan", "save", "deliver"})
+        self.assertEqual(second.total("sent"), 0)
+        self.assertEqual(second.categories["invoice"]["deduplicated"], 40)
+        self.assertEqual(second.categories["timeentry"]["deduplicated"], 40)
+
+
+class NotificationIndexTests(TestCase):
+    def assertUsesIndex(self, queryset, fields):
+        (index,) = [
+            index
+            for index in Notification._meta.indexes
+            if index.fields == list(fields)
+        ]
+        self.assertIn(index.name, queryset.explain())
+
+    def test_dedup_lookup_uses_source_index(self):
+        content_type = ContentType.objects.get_for_model(Project)
+        queryset = Notification.objects.filter(
+            recipient="client@example.com",
+            subject="Project Deadline Reminder: Test",
+            content_type=content_type,
+            object_id=1,
+            **created_on(timezone.localdate()),
+        )
+        self.assertUsesIndex(queryset, ["content_type", "object_id", "created_at"])
+
+    def test_history_lookup_uses_source_index(self):
+        content_type = ContentType.objects.get_for_model(TimeEntry)
+        queryset = Notification.objects.filter(
+            content_type=content_type, object_id__in=[1, 2, 3]
+        )
+        self.assertUsesIndex(queryset, ["content_type", "object_id", "created_at"])
+
+    def test_sent_today_lookup_uses_created_at_index(self):
+        queryset = Notification.objects.filter(
+            content_type__isnull=False, **created_on(timezone.localdate())
+        )
+        self.assertUsesIndex(queryset, ["created_at"])
+
+
+class InlineExecutor:
+    """Runs submitted calls in the test process, where the test data lives."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class SchedulerTests(TestCase):
+    def setUp(self):
+        ensure_jobs()
+        self.client = Client.objects.create(
+            name="Test Client", email="client@example.com"
+        )
+
+    def test_due_jobs_run_and_are_rescheduled(self):
+        project = Project.objects.create(name="Project", client=self.client)
+        invoice = Invoice.objects.create(
+            client=self.client,
+            project=project,
+            amount=Decimal("100.00"),
+            due_date=timezone.localdate() - timedelta(days=1),
+            status="SENT",
+        )
+
+        with self.settings(SCHEDULER_JOBS={"overdue_sweep": 600}):
+            self.assertEqual(run_due_jobs("worker-1"), ["overdue_sweep"])
+            # Not due again until the interval has passed
+            self.assertEqual(run_due_jobs("worker-1"), [])
+
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.status, "OVERDUE")
+        job = SchedulerJob.objects.get(name="overdue_sweep")
+        self.assertIsNotNone(job.last_duration)
+        self.assertIsNone(job.locked_until)
+        self.assertGreater(job.next_run_at, timezone.now() + timedelta(seconds=500))
+
+    def test_scan_job_only_queues_notifications(self):
+        Project.objects.create(
+            name="Project",
+            client=self.client,
+            deadline=timezone.localdate() + timedelta(days=1),
+        )
+
+        with self.settings(
+            ADMINS=[("Admin", "admin@example.com")],
+            SCHEDULER_JOBS={"notification_scan": 3600},
+        ):
+            ensure_jobs()
+            self.assertEqual(run_due_jobs("worker-1"), ["notification_scan"])
+
+        # Sending is left to the outbox drain
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Notification.objects.filter(status="PENDING").count(), 2)
+
+    def test_locked_job_is_not_run_by_another_worker(self):
+        self.assertTrue(acquire_job("outbox_drain", "worker-1"))
+        self.assertFalse(acquire_job("outbox_drain", "worker-2"))
+
+        # The lock of a crashed worker expires
+        SchedulerJob.objects.filter(name="outbox_drain").update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertTrue(acquire_job("outbox_drain", "worker-2"))
+
+    def test_failed_job_records_error_and_releases_lock(self):
+        with mock.patch.dict(
+            "src.models.scheduler.JOBS",
+            {"retry_sweep": mock.Mock(side_effect=RuntimeError("SMTP down"))},
+        ):
+            with self.settings(SCHEDULER_JOBS={"retry_sweep": 60}):
+                run_due_jobs("worker-1")
+
+        job = SchedulerJob.objects.get(name="retry_sweep")
+        self.assertEqual(job.last_error, "SMTP down")
+        self.assertEqual(job.locked_by, "")